@@ -15,20 +15,42 @@
 
 
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
+import argparse
+import datetime
+import json
 import os
+import random
+import sys
 from time import sleep
 
-#create data class for month
-@dataclass
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; without it compute_offsets() loops in Python
+    np = None
+
+#create data class for month, frozen so the shared table below can never be changed
+#(slots=True needs Python 3.10 or later)
+@dataclass(frozen=True, slots=True)
 class Month:
+    name: str
+    days: int  # the day count in a common year; use days_in_month() for a given year
+
+#everything needed to draw one month of one year, worked out fresh on every call
+@dataclass(frozen=True, slots=True)
+class MonthInfo:
+    month: int
+    year: int
     name: str
     days: int
+    dow: int  # day of the week of the 1st (0 = Sunday, 6 = Saturday)
 
 # dictionary to hold month number, name, and day count
 months = {
     1: Month("January", 31),
-    2: Month("February", 28),  # this will change if there is a leap year, 28 or 29 days
+    2: Month("February", 28),  # 29 in a leap year, see days_in_month()
     3: Month("March", 31),
     4: Month("April", 30),
     5: Month("May", 31),
@@ -45,28 +67,35 @@ months = {
 def is_leap_year(year):
     return (year % 4 == 0 and (year % 100 != 0 or year % 400 == 0))
 
+# days in the year before the first of each month (index 1-12) in a common year;
+# a leap year adds one day from March on
+DAYS_BEFORE_MONTH = (0, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+
+# the number of leap years from year 1 through the given year, counted with the Gregorian rules
+def leap_years_through(year):
+    return year // 4 - year // 100 + year // 400
+
+# the number of days in a month, with February worked out for the given year
+def days_in_month(month, year):
+    if month == 2 and is_leap_year(year):
+        return 29
+    return months[month].days
+
 # this calculates the days since January 1, 1753, since that is the earlies the program will go, we can reference it.
+# it is closed form, so it takes the same time for any year, and it never changes the months table
 def calculate_days_since_1753(month, year):
-    # adjust february if it was a leap year
-    if is_leap_year(year):
-        months[2].days = 29
-    else:
-        months[2].days = 28
-
-    total_days = 0
+    # 365 days for every whole year since 1753, plus one for each leap year among them
+    total_days = 365 * (year - 1753) + leap_years_through(year - 1) - leap_years_through(1752)
 
-    # go through each year between 1753 and input year and add the days
-    # this will account for leap years as well
-    for y in range(1753, year):
-        total_days += 365
-        if is_leap_year(y):
-            total_days += 1
+    # add the days for the months of the current year up to the target month
+    total_days += DAYS_BEFORE_MONTH[month]
+    if month > 2 and is_leap_year(year):
+        total_days += 1
 
-    # go through and add the days for the months of the current year up to the target month
-    for m in range(1, month):
-        total_days += months[m].days
+    return total_days, days_in_month(month, year)
 
-    return total_days, months[month].days
+# the number of days in each month (index 1-12) in a common year, for array lookups
+MONTH_DAYS = (0,) + tuple(months[month].days for month in range(1, 13))
 
 # this function will compute the day of the week (0 = Sunday, 6 = Saturday)
 def compute_offset(month, year):
@@ -75,35 +104,169 @@ def compute_offset(month, year):
     day_of_week = (total_days + 1) % 7  # 1 because Jan 1, 1753 is Monday (day 1)
     return day_of_week
 
-# this functino will format our calender for displaying based on input month and year
-def display_table(month, year, num_days, dow):
-    # create the table header with month and year
-    month_name = months[month].name
-    print("")
-    print(f"Calendar for {month_name}, {year}")
-    print("")
-    print(" Su  Mo  Tu  We  Th  Fr  Sa")
-
-    # print leading spaces for the first week if dow is not zero
-    for _ in range(dow):
-        print("    ", end="")
-
-    # print the days of the month
-    for dom in range(1, num_days + 1):
-        # print day number with consistent width, so they are aligned properly
-        print(f"{dom:>3}", end=" ")
+# this computes the day of the week and the number of days in the month for many dates at once.
+# month_values and year_values (and day_values, the day of the month, which defaults to the 1st)
+# can be NumPy arrays or any sequences of the same length. With NumPy installed the work is done
+# with array arithmetic and NumPy arrays are returned; otherwise lists are returned.
+def compute_offsets(month_values, year_values, day_values=None):
+    if np is None:
+        if day_values is None:
+            day_values = [1] * len(month_values)
+        weekdays, lengths = [], []
+        for month, year, day in zip(month_values, year_values, day_values, strict=True):
+            if not 1 <= month <= 12 or year < 1753:
+                raise ValueError(f"invalid month/year {month}/{year}")
+            total_days, num_days = calculate_days_since_1753(month, year)
+            if not 1 <= day <= num_days:
+                raise ValueError(f"invalid day {day} for {month}/{year}")
+            weekdays.append((total_days + day) % 7)
+            lengths.append(num_days)
+        return weekdays, lengths
 
-        # increment the day of the week (dow)
-        dow += 1
+    month_array = np.asarray(month_values, dtype=np.int64)
+    year_array = np.asarray(year_values, dtype=np.int64)
+    day_array = np.ones_like(month_array) if day_values is None else np.asarray(day_values, dtype=np.int64)
+    if not month_array.shape == year_array.shape == day_array.shape:
+        raise ValueError("month, year and day arrays must have the same shape")
+    if ((month_array < 1) | (month_array > 12)).any() or (year_array < 1753).any():
+        raise ValueError("months must be 1-12 and years 1753 or later")
 
+    # the same closed form as calculate_days_since_1753(), one array operation at a time
+    leap = (year_array % 4 == 0) & ((year_array % 100 != 0) | (year_array % 400 == 0))
+    total_days = (365 * (year_array - 1753) + leap_years_through(year_array - 1) - leap_years_through(1752)
+                  + np.asarray(DAYS_BEFORE_MONTH)[month_array] + ((month_array > 2) & leap))
+    num_days = np.asarray(MONTH_DAYS)[month_array] + ((month_array == 2) & leap)
+    if ((day_array < 1) | (day_array > num_days)).any():
+        raise ValueError("days must fall inside their month")
+
+    return (total_days + day_array) % 7, num_days
+
+# this returns everything about a month in a given year without changing any shared
+# state, so it is safe to call from many threads at once
+def month_info(month, year):
+    total_days, num_days = calculate_days_since_1753(month, year)
+    return MonthInfo(month, year, months[month].name, num_days, (total_days + 1) % 7)
+
+# the header row above every month
+WEEKDAY_HEADER = " Su  Mo  Tu  We  Th  Fr  Sa\n"
+
+# this builds the rows of day numbers for a month. There are only 7 starting days and 4
+# month lengths, so every grid is built once and cached; the Gregorian calendar repeats
+# every 400 years, so rendering many years mostly joins cached strings
+@lru_cache(maxsize=None)
+def month_grid(dow, num_days, leap=False):
+    # leap is part of the cache key so each (start weekday, length, leap) layout is kept apart,
+    # even though only February's length depends on it
+    cells = ["    "] * dow  # leading spaces for the first week
+    for dom in range(1, num_days + 1):
+        # day number with consistent width, so they are aligned properly
+        cells.append(f"{dom:>3} ")
+        dow += 1
         # if we reach the end of the week (Saturday), move to the next line
         if dow % 7 == 0:
-            print()
-
-    # Ensure the last line is complete if necessary
+            cells.append("\n")
+    # make sure the last line is complete if necessary
     if dow % 7 != 0:
-        print()  # Print a newline if the last row is incomplete
-    print("")
+        cells.append("\n")
+    return "".join(cells)
+
+# this formats our calender for one month as a string, exactly as display_table() shows it
+def render_month(month, year, num_days, dow):
+    return (f"\nCalendar for {months[month].name}, {year}\n\n" + WEEKDAY_HEADER
+            + month_grid(dow, num_days, is_leap_year(year)) + "\n")
+
+# this formats all twelve months of a year
+def render_year(year):
+    parts = []
+    for month in range(1, 13):
+        info = month_info(month, year)
+        parts.append(render_month(month, year, info.days, info.dow))
+    return "".join(parts)
+
+# this formats every year from first_year through last_year into one string
+def render_years(first_year, last_year):
+    return "".join(render_year(year) for year in range(first_year, last_year + 1))
+
+# this writes the calendars for a range of years with a single write
+def display_years(first_year, last_year, file=None):
+    (file or sys.stdout).write(render_years(first_year, last_year))
+
+# this functino will format our calender for displaying based on input month and year
+def display_table(month, year, num_days, dow):
+    # build the whole table, then write it at once
+    sys.stdout.write(render_month(month, year, num_days, dow))
+
+# the names of the days of the week, indexed like compute_offset() (0 = Sunday)
+WEEKDAY_NAMES = ("Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday")
+
+# this turns "YYYY-MM-DD" into a (year, month, day) tuple, checking it is a real date from 1753 on
+def parse_date(text):
+    try:
+        year, month, day = (int(part) for part in text.split("-"))
+    except ValueError:
+        raise ValueError(f"'{text}' is not a date in the form YYYY-MM-DD") from None
+    if year < 1753 or not 1 <= month <= 12 or not 1 <= day <= days_in_month(month, year):
+        raise ValueError(f"'{text}' is not a valid date from 1753 on")
+    return year, month, day
+
+# this yields (year, month, day, weekday) for every day from first through last, both
+# (year, month, day) tuples. Only one month is worked out at a time, so any range takes
+# the same small amount of memory and the first day comes out straight away
+def iter_days(first, last):
+    year, month, day = first
+    while (year, month) <= last[:2]:
+        dow = compute_offset(month, year)
+        last_day = last[2] if (year, month) == last[:2] else days_in_month(month, year)
+        for dom in range(day, last_day + 1):
+            yield year, month, dom, (dow + dom - 1) % 7
+        # move on to the 1st of the next month
+        day = 1
+        month += 1
+        if month > 12:
+            month = 1
+            year += 1
+
+# these turn the days from iter_days() into lines of text, one format each
+def csv_lines(days):
+    yield "date,year,month,month_name,day,weekday,weekday_name\n"
+    for year, month, day, weekday in days:
+        yield (f"{year:04d}-{month:02d}-{day:02d},{year},{month},{months[month].name},"
+               f"{day},{weekday},{WEEKDAY_NAMES[weekday]}\n")
+
+def jsonl_lines(days):
+    for year, month, day, weekday in days:
+        yield json.dumps({"date": f"{year:04d}-{month:02d}-{day:02d}", "year": year, "month": month,
+                          "month_name": months[month].name, "day": day, "weekday": weekday,
+                          "weekday_name": WEEKDAY_NAMES[weekday]}) + "\n"
+
+def ical_lines(days):
+    # iCalendar wants CRLF line endings, a DTSTAMP on every event and commas in text escaped
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    yield "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//CSE131//Calendar//EN\r\n"
+    for year, month, day, weekday in days:
+        date = f"{year:04d}{month:02d}{day:02d}"
+        yield (f"BEGIN:VEVENT\r\nUID:{date}@calender\r\nDTSTAMP:{stamp}\r\n"
+               f"DTSTART;VALUE=DATE:{date}\r\n"
+               f"SUMMARY:{WEEKDAY_NAMES[weekday]}\\, {months[month].name} {day}\\, {year}\r\n"
+               f"END:VEVENT\r\n")
+    yield "END:VCALENDAR\r\n"
+
+EXPORT_FORMATS = {"csv": csv_lines, "jsonl": jsonl_lines, "ics": ical_lines}
+
+# this writes every day from first through last to file in the given format, streaming
+# line by line, and returns how many days were written
+def export_calendar(first, last, export_format, file=None):
+    if first > last:
+        raise ValueError("the first date must not be after the last date")
+    file = file or sys.stdout
+    count = 0
+    def counted(days):
+        nonlocal count
+        for entry in days:
+            count += 1
+            yield entry
+    file.writelines(EXPORT_FORMATS[export_format](counted(iter_days(first, last))))
+    return count
 
 def main():
     # Get valid month input (1-12)
@@ -136,16 +299,100 @@ def main():
             print("ERROR: Year must be an integer.")
             sleep(1)
 
-    # Get the starting day of the week for the 1st of the month
-    dow = compute_offset(month, year)
-
-    # Get the number of days in the month
-    _, num_days = calculate_days_since_1753(month, year)
+    # Get the starting day of the week for the 1st of the month and the number of days in it
+    info = month_info(month, year)
     
     os.system('cls')
     # Display the calendar table
-    display_table(month, year, num_days, dow)
+    display_table(month, year, info.days, info.dow)
+
+# this hammers month_info() from a thread pool, mixing leap and common years, and checks
+# every answer against Python's datetime module
+def test_month_info_threads(workers=16, calls=20000):
+    rng = random.Random(1753)
+    cases = [(rng.randint(1, 12), rng.choice((1900, 2000, 2023, 2024)) + rng.randint(0, 400))
+             for _ in range(calls)]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda case: month_info(*case), cases))
+
+    for (month, year), info in zip(cases, results):
+        first = datetime.date(year, month, 1)
+        following = datetime.date(year + month // 12, month % 12 + 1, 1)
+        assert info.month == month and info.year == year
+        assert info.days == (following - first).days, (month, year, info)
+        assert info.dow == first.isoweekday() % 7, (month, year, info)
+    assert months[2].days == 28
+
+    print(f"month_info() correct for {calls} calls on {workers} threads")
+
+# this checks compute_offsets() against the scalar compute_offset() and days_in_month(), from the
+# 1753 lower bound on, with NumPy (when it is installed) and with the plain Python fallback
+def test_compute_offsets(calls=20000):
+    global np
+    rng = random.Random(1752)
+    month_values = [rng.randint(1, 12) for _ in range(calls)] + list(range(1, 13))
+    year_values = [rng.randint(1753, 3000) for _ in range(calls)] + [1753] * 12
+    day_values = [rng.randint(1, days_in_month(month, year)) for month, year in zip(month_values, year_values)]
+    expected_weekdays = [(compute_offset(month, year) + day - 1) % 7
+                         for month, year, day in zip(month_values, year_values, day_values)]
+    expected_lengths = [days_in_month(month, year) for month, year in zip(month_values, year_values)]
+
+    numpy_module = np
+    paths = ("NumPy", "fallback") if numpy_module is not None else ("fallback",)
+    try:
+        for path in paths:
+            np = numpy_module if path == "NumPy" else None
+            weekdays, lengths = compute_offsets(month_values, year_values, day_values)
+            assert list(weekdays) == expected_weekdays, path
+            assert list(lengths) == expected_lengths, path
+            first_weekdays, _ = compute_offsets(month_values, year_values)
+            assert list(first_weekdays) == [compute_offset(month, year)
+                                            for month, year in zip(month_values, year_values)], path
+    finally:
+        np = numpy_module
+
+    print(f"compute_offsets() matches the scalar path for {len(month_values)} dates ({', '.join(paths)})")
+
+# this handles the non-interactive options; with no options the program asks for a month and year
+def run_cli(arguments):
+    parser = argparse.ArgumentParser(description="Show calendars from 1753 on.")
+    parser.add_argument("--test", action="store_true", help="run the thread-safety and batch tests")
+    parser.add_argument("--year", type=int, help="show all twelve months of one year")
+    parser.add_argument("--years", type=int, nargs=2, metavar=("FIRST", "LAST"),
+                        help="show every year from FIRST through LAST")
+    parser.add_argument("--export", choices=sorted(EXPORT_FORMATS),
+                        help="write every day from --from through --to as CSV, JSON Lines or iCalendar")
+    parser.add_argument("--from", dest="first", metavar="YYYY-MM-DD", help="first day to export")
+    parser.add_argument("--to", dest="last", metavar="YYYY-MM-DD", help="last day to export")
+    parser.add_argument("--output", help="file to export to (standard output if not given)")
+    options = parser.parse_args(arguments)
+
+    if options.test:
+        test_month_info_threads()
+        test_compute_offsets()
+    first_year, last_year = options.years or (options.year, options.year)
+    if first_year is not None:
+        if first_year < 1753 or last_year < first_year:
+            parser.error("years must be 1753 or later, FIRST no later than LAST")
+        display_years(first_year, last_year)
+    if options.export:
+        if not (options.first and options.last):
+            parser.error("--export needs --from and --to")
+        try:
+            first, last = parse_date(options.first), parse_date(options.last)
+            if options.output:
+                # newline="" so the iCalendar CRLF line endings are written as they are
+                with open(options.output, "w", encoding="utf-8", newline="") as file:
+                    export_calendar(first, last, options.export, file)
+            else:
+                export_calendar(first, last, options.export)
+        except ValueError as error:
+            parser.error(str(error))
 
 # Run the program
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1:
+        run_cli(sys.argv[1:])
+    else:
+        main()
@@ -9,8 +9,27 @@
 # 5. How long did it take for you to complete the assignment?
 #      1 1/2 hours including writing the program, recording and submitting.
 
+import multiprocessing
+import os
+import random
+import sys
+import time
+from array import array as TypedArray
+from multiprocessing import shared_memory
 
-def segregate(array, iBegin, iEnd):
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; without it every input takes the pure Python path
+    np = None
+
+# array.array type codes that hold plain numbers NumPy can sort
+NUMERIC_TYPECODES = 'bBhHiIlLqQfd'
+
+# Lists shorter than this are not worth converting to NumPy
+NUMPY_THRESHOLD = 1000
+
+
+def segregate(array, iBegin, iEnd, values=None):
     '''
     Partition function for quicksort.
     Rearranges elements in the array such that elements less than or equal to the pivot 
@@ -20,6 +39,7 @@ def segregate(array, iBegin, iEnd):
         array (list): The list of elements to sort.
         iBegin (int): Starting index of the segment to partition.
         iEnd (int): Ending index of the segment to partition.
+        values (list): Optional list moved in step with array (used for key= sorts).
     
     Returns:
         int: The index where the pivot element is placed after partitioning.
@@ -44,6 +64,8 @@ def segregate(array, iBegin, iEnd):
         # Swap elements that are out of place
         if iUp < iDown:
             array[iUp], array[iDown] = array[iDown], array[iUp]
+            if values is not None:
+                values[iUp], values[iDown] = values[iDown], values[iUp]
 
     iPivotSwap = iUp  # Index where pivot will be swapped
 
@@ -53,10 +75,52 @@ def segregate(array, iBegin, iEnd):
 
     # Swap pivot with element at its final sorted position
     array[iPivotSwap], array[iPivot] = array[iPivot], array[iPivotSwap]
+    if values is not None:
+        values[iPivotSwap], values[iPivot] = values[iPivot], values[iPivotSwap]
 
     return iPivotSwap  # Return the new pivot position
 
 
+def segregate_three_way(array, iBegin, iEnd, values=None):
+    '''
+    Three-way (Dutch national flag) partition function for quicksort.
+    Uses the middle element as the pivot and rearranges the segment into three parts:
+    elements less than the pivot, elements equal to it, and elements greater than it.
+    Every element equal to the pivot is placed in this single pass, so runs of equal
+    keys are never partitioned again.
+    
+    Parameters:
+        array (list): The list of elements to sort.
+        iBegin (int): Starting index of the segment to partition.
+        iEnd (int): Ending index of the segment to partition.
+        values (list): Optional list moved in step with array (used for key= sorts).
+    
+    Returns:
+        tuple: (iLess, iGreater), the first and last index of the elements equal to the pivot.
+    '''
+    pivot = array[(iBegin + iEnd) // 2]
+    iLess = iBegin  # Everything before iLess is less than the pivot
+    iCurrent = iBegin  # Next element to look at
+    iGreater = iEnd  # Everything after iGreater is greater than the pivot
+
+    while iCurrent <= iGreater:
+        if array[iCurrent] < pivot:
+            array[iLess], array[iCurrent] = array[iCurrent], array[iLess]
+            if values is not None:
+                values[iLess], values[iCurrent] = values[iCurrent], values[iLess]
+            iLess += 1
+            iCurrent += 1
+        elif array[iCurrent] > pivot:
+            array[iCurrent], array[iGreater] = array[iGreater], array[iCurrent]
+            if values is not None:
+                values[iCurrent], values[iGreater] = values[iGreater], values[iCurrent]
+            iGreater -= 1
+        else:
+            iCurrent += 1
+
+    return iLess, iGreater
+
+
 def sort_recursive(array, iBegin, iEnd):
     '''
     Recursive quicksort function.
@@ -79,21 +143,501 @@ def sort_recursive(array, iBegin, iEnd):
     sort_recursive(array, iPivot + 1, iEnd)
 
 
-def sort(array):
+# Ranges this small are finished with insertion sort instead of being partitioned again
+INSERTION_THRESHOLD = 16
+
+# Ranges larger than this pick the pivot with Tukey's ninther instead of median-of-three
+NINTHER_THRESHOLD = 40
+
+
+def insertion_sort(array, iBegin, iEnd, values=None):
+    '''
+    Insertion sort for a small segment of the array.
+    
+    Parameters:
+        array (list): The list of elements to sort.
+        iBegin (int): Starting index of the segment.
+        iEnd (int): Ending index of the segment (inclusive).
+        values (list): Optional list moved in step with array (used for key= sorts).
+    '''
+    for iCurrent in range(iBegin + 1, iEnd + 1):
+        value = array[iCurrent]
+        iCheck = iCurrent - 1
+        # Shift larger elements right until the value's place is found
+        while iCheck >= iBegin and array[iCheck] > value:
+            array[iCheck + 1] = array[iCheck]
+            iCheck -= 1
+        array[iCheck + 1] = value
+        # Shift the companion values the same distance
+        if values is not None and iCheck + 1 != iCurrent:
+            companion = values[iCurrent]
+            values[iCheck + 2:iCurrent + 1] = values[iCheck + 1:iCurrent]
+            values[iCheck + 1] = companion
+
+
+def heapsort(array, iBegin, iEnd, values=None):
+    '''
+    Heapsort for a segment of the array. Used by introsort when partitioning keeps
+    going badly, because it is O(n log n) for every input.
+    
+    Parameters:
+        array (list): The list of elements to sort.
+        iBegin (int): Starting index of the segment.
+        iEnd (int): Ending index of the segment (inclusive).
+        values (list): Optional list moved in step with array (used for key= sorts).
+    '''
+    size = iEnd - iBegin + 1
+
+    def sift_down(iRoot, heapSize):
+        # Move the element at iRoot down until both children are smaller
+        value = array[iBegin + iRoot]
+        companion = values[iBegin + iRoot] if values is not None else None
+        iChild = 2 * iRoot + 1
+        while iChild < heapSize:
+            if iChild + 1 < heapSize and array[iBegin + iChild + 1] > array[iBegin + iChild]:
+                iChild += 1
+            if array[iBegin + iChild] <= value:
+                break
+            array[iBegin + iRoot] = array[iBegin + iChild]
+            if values is not None:
+                values[iBegin + iRoot] = values[iBegin + iChild]
+            iRoot = iChild
+            iChild = 2 * iRoot + 1
+        array[iBegin + iRoot] = value
+        if values is not None:
+            values[iBegin + iRoot] = companion
+
+    # Build a max-heap, then repeatedly move the largest element to the end
+    for iRoot in range(size // 2 - 1, -1, -1):
+        sift_down(iRoot, size)
+    for heapSize in range(size - 1, 0, -1):
+        array[iBegin], array[iBegin + heapSize] = array[iBegin + heapSize], array[iBegin]
+        if values is not None:
+            values[iBegin], values[iBegin + heapSize] = values[iBegin + heapSize], values[iBegin]
+        sift_down(0, heapSize)
+
+
+def median_of_three(array, i1, i2, i3):
     '''
-    Public function to sort a list using quicksort.
+    Returns the index of the median of three elements.
+    '''
+    if array[i1] < array[i2]:
+        if array[i2] < array[i3]:
+            return i2
+        return i3 if array[i1] < array[i3] else i1
+    if array[i1] < array[i3]:
+        return i1
+    return i3 if array[i2] < array[i3] else i2
+
+
+def choose_pivot(array, iBegin, iEnd):
+    '''
+    Picks a pivot index: median-of-three for smaller segments and Tukey's ninther
+    (the median of three medians-of-three) for larger ones, which defeats sorted,
+    reversed and organ-pipe inputs that make the middle element a bad pivot.
+    
+    Parameters:
+        array (list): The list of elements to sort.
+        iBegin (int): Starting index of the segment.
+        iEnd (int): Ending index of the segment (inclusive).
+    
+    Returns:
+        int: The index of the chosen pivot.
+    '''
+    iMiddle = (iBegin + iEnd) // 2
+    size = iEnd - iBegin + 1
+    if size <= NINTHER_THRESHOLD:
+        return median_of_three(array, iBegin, iMiddle, iEnd)
+    step = size // 8
+    return median_of_three(array,
+                           median_of_three(array, iBegin, iBegin + step, iBegin + 2 * step),
+                           median_of_three(array, iMiddle - step, iMiddle, iMiddle + step),
+                           median_of_three(array, iEnd - 2 * step, iEnd - step, iEnd))
+
+
+def sort_introsort(array, three_way=False, values=None):
+    '''
+    Introsort: quicksort with an explicit stack instead of recursion.
+    The larger partition is always pushed and the smaller one is handled first, so the
+    stack never holds more than about log2(n) ranges. A segment that is partitioned
+    more than 2*log2(n) times is handed to heapsort, and small segments use insertion sort.
     
     Parameters:
         array (list): The list of elements to be sorted.
+        three_way (bool): Partition with segregate_three_way() so keys equal to the
+                          pivot are finished in one pass (best for many duplicates).
+        values (list): Optional list moved in step with array, so sorting a list of
+                       cached keys also sorts the records they came from.
+    '''
+    if len(array) < 2:
+        return
+    stack = [(0, len(array) - 1, 2 * (len(array).bit_length()))]
+
+    while stack:
+        iBegin, iEnd, depthLimit = stack.pop()
+
+        while iEnd - iBegin + 1 > INSERTION_THRESHOLD:
+            if depthLimit == 0:
+                # Too many bad partitions: finish this segment with heapsort
+                heapsort(array, iBegin, iEnd, values)
+                break
+            depthLimit -= 1
+
+            # Move the chosen pivot to the middle, where segregate() expects it
+            iPivot = choose_pivot(array, iBegin, iEnd)
+            iMiddle = (iBegin + iEnd) // 2
+            array[iPivot], array[iMiddle] = array[iMiddle], array[iPivot]
+            if values is not None:
+                values[iPivot], values[iMiddle] = values[iMiddle], values[iPivot]
+            if three_way:
+                iLess, iGreater = segregate_three_way(array, iBegin, iEnd, values)
+            else:
+                iLess = iGreater = segregate(array, iBegin, iEnd, values)
+
+            # Push the larger partition and keep working on the smaller one
+            if iLess - iBegin > iEnd - iGreater:
+                stack.append((iBegin, iLess - 1, depthLimit))
+                iBegin = iGreater + 1
+            else:
+                stack.append((iGreater + 1, iEnd, depthLimit))
+                iEnd = iLess - 1
+        else:
+            insertion_sort(array, iBegin, iEnd, values)
+
+
+def vectorized_sort(array, kind):
+    '''
+    Sorts homogeneous numeric input in place with NumPy, without the interpreted loop.
+    NumPy arrays, numeric array.array objects and writable numeric memoryviews are
+    sorted directly on their buffer; lists of only ints or only floats are sorted in
+    NumPy and copied back. Keep in step with vectorized_sort() in subList/subList.py.
+    
+    Parameters:
+        array: The list, array.array, memoryview or NumPy array to sort.
+        kind (str): The NumPy sort algorithm to use.
     
     Returns:
-        list: The sorted list.
+        bool: True if the input was sorted here, False if it needs the regular sort.
+    '''
+    if np is None:
+        return False
+
+    if isinstance(array, np.ndarray):
+        if array.ndim != 1 or array.dtype.kind not in 'iuf':
+            return False
+        array.sort(kind=kind)
+        return True
+
+    if isinstance(array, TypedArray):
+        if array.typecode not in NUMERIC_TYPECODES:
+            return False
+        if len(array) > 1:
+            # A NumPy view over the array's own memory, so nothing is copied
+            np.frombuffer(array, dtype=array.typecode).sort(kind=kind)
+        return True
+
+    if isinstance(array, memoryview):
+        if array.format not in NUMERIC_TYPECODES or array.readonly or not array.c_contiguous:
+            return False
+        if len(array) > 1:
+            np.frombuffer(array, dtype=array.format).sort(kind=kind)
+        return True
+
+    if isinstance(array, list) and len(array) >= NUMPY_THRESHOLD:
+        types = set(map(type, array))
+        if types != {int} and types != {float}:
+            return False
+        values = np.array(array)
+        # Ints outside int64/uint64 come back as floats or objects, which would lose
+        # precision, so only sort here when NumPy kept the exact kind of number
+        if values.dtype.kind not in ('iu' if types == {int} else 'f'):
+            return False
+        values.sort(kind=kind)
+        array[:] = values.tolist()
+        return True
+
+    return False
+
+
+def sort(array, three_way=False, key=None, reverse=False):
     '''
-    # Start the recursive sort with full array bounds
-    sort_recursive(array, 0, len(array) - 1)
+    Public function to sort a list using quicksort (introsort variant).
+    Numeric input (NumPy arrays, numeric array.array, large lists of only ints or
+    only floats) is sorted in place by NumPy when it is installed.
+    Quicksort is NOT stable: elements with equal keys may end up in any order.
+    Use sublist_sort() from subList.py when the original order of ties matters.
+    
+    Parameters:
+        array (list): The list of elements to be sorted.
+        three_way (bool): Use three-way partitioning, which is faster when the
+                          list holds long runs of equal keys.
+        key (function): Called once per element; the elements are ordered by the results.
+                        The keys are cached in a list that is sorted alongside the elements.
+        reverse (bool): Sort in descending order.
+    
+    Returns:
+        list: The sorted list (the same object that was passed in).
+    '''
+    if key is not None:
+        keys = [key(value) for value in array]
+        sort_introsort(keys, three_way, values=array)
+    elif not vectorized_sort(array, 'quicksort'):
+        sort_introsort(array, three_way)
+    if reverse:
+        array[:] = array[::-1]
     return array
 
 
+def benchmark_partitions(size=200000, cardinalities=(2, 10, 100, 1000), repeat=3):
+    '''
+    Times two-way against three-way partitioning on low-cardinality inputs
+    (random keys drawn from only a few distinct values) and prints a table.
+    
+    Parameters:
+        size (int): Number of elements in each input.
+        cardinalities (tuple): Numbers of distinct keys to test.
+        repeat (int): Runs per case; the best time is kept.
+    
+    Returns:
+        dict: Best time in seconds, keyed by (cardinality, 'two-way' or 'three-way').
+    '''
+    rng = random.Random(131)
+    results = {}
+    print(f"{'distinct keys':>13} {'two-way':>10} {'three-way':>10} {'speedup':>8}")
+    for cardinality in cardinalities:
+        data = [rng.randrange(cardinality) for _ in range(size)]
+        for three_way in (False, True):
+            best = float('inf')
+            for _ in range(repeat):
+                array = data[:]
+                start = time.perf_counter()
+                # Call the introsort directly: sort() would hand int lists to NumPy
+                sort_introsort(array, three_way)
+                best = min(best, time.perf_counter() - start)
+            results[(cardinality, 'three-way' if three_way else 'two-way')] = best
+        twoWay = results[(cardinality, 'two-way')]
+        threeWay = results[(cardinality, 'three-way')]
+        print(f"{cardinality:>13} {twoWay:>9.3f}s {threeWay:>9.3f}s {twoWay / threeWay:>7.1f}x")
+    return results
+
+
+# Arrays shorter than this are sorted on a single core; process start-up would cost more
+PARALLEL_THRESHOLD = 1000000
+
+# Each worker process gets about this many sub-ranges, so uneven partitions still balance out
+RANGES_PER_PROCESS = 4
+
+
+def _shared_typecode(array):
+    '''
+    Picks the array.array type code used to hold the values in shared memory.
+    
+    Parameters:
+        array: The list, array.array or NumPy array to sort.
+    
+    Returns:
+        str: A type code from NUMERIC_TYPECODES, or None if the input is not plain numbers.
+    '''
+    if isinstance(array, list):
+        types = set(map(type, array))
+        if types == {float}:
+            return 'd'
+        if types == {int} and -2 ** 63 <= min(array) and max(array) < 2 ** 63:
+            return 'q'
+        return None
+    try:
+        view = memoryview(array)
+    except TypeError:
+        return None
+    typecode = view.format.lstrip('@=<')
+    if view.ndim != 1 or not view.c_contiguous or typecode not in NUMERIC_TYPECODES:
+        return None
+    return typecode
+
+
+def _move_nans_to_end(view):
+    '''
+    Moves every NaN in a float buffer to the end, keeping the other values in order,
+    so no NaN can be picked as a pivot (NaN is neither less nor greater than anything).
+    NaNs end up last, where NumPy's sort and sort() put them.
+    
+    Parameters:
+        view (memoryview): The shared buffer, cast to 'f' or 'd'.
+    
+    Returns:
+        int: Number of values before the NaNs.
+    '''
+    if np is not None:
+        values = np.frombuffer(view, dtype=view.format)
+        isNan = np.isnan(values)
+        nanCount = int(isNan.sum())
+        if nanCount:
+            values[:] = np.concatenate((values[~isNan], values[isNan]))
+        return len(values) - nanCount
+    nans = []
+    iWrite = 0
+    for value in view:
+        if value != value:
+            nans.append(value)  # Kept, not recreated, so NaN payloads survive
+        else:
+            view[iWrite] = value
+            iWrite += 1
+    for iNan, value in enumerate(nans):
+        view[iWrite + iNan] = value
+    return iWrite
+
+
+def _partition_shared_range(view, iBegin, iEnd):
+    '''
+    Three-way partitions one range of the shared buffer around a ninther pivot.
+    With NumPy installed the partition is done with vectorized comparisons;
+    otherwise segregate_three_way() runs directly on the memoryview.
+    
+    Parameters:
+        view (memoryview): The shared buffer, cast to the values' type code.
+        iBegin (int): Starting index of the range.
+        iEnd (int): Ending index of the range (inclusive).
+    
+    Returns:
+        tuple: (iLess, iGreater), the first and last index of the elements equal to the pivot.
+    '''
+    iPivot = choose_pivot(view, iBegin, iEnd)
+    if np is not None:
+        pivot = view[iPivot]
+        segment = np.frombuffer(view, dtype=view.format)[iBegin:iEnd + 1]
+        isLess = segment < pivot
+        isGreater = segment > pivot
+        less = segment[isLess]
+        greater = segment[isGreater]
+        # The middle band is copied, not filled with the pivot: values such as NaN
+        # are neither less nor greater than the pivot and must not be lost
+        middle = segment[~(isLess | isGreater)]
+        equalCount = len(middle)
+        segment[:len(less)] = less
+        segment[len(less):len(less) + equalCount] = middle
+        segment[len(less) + equalCount:] = greater
+        return iBegin + len(less), iBegin + len(less) + equalCount - 1
+    # Move the pivot to the middle, where segregate_three_way() expects it
+    iMiddle = (iBegin + iEnd) // 2
+    view[iPivot], view[iMiddle] = view[iMiddle], view[iPivot]
+    return segregate_three_way(view, iBegin, iEnd)
+
+
+def _sort_shared_range(task):
+    '''
+    Worker function for parallel_sort(). Attaches to the shared buffer by name and
+    sorts one sub-range in place with sort() through a memoryview of the buffer
+    (NumPy sorts the view directly when it is installed). Only the buffer name and
+    the range bounds are pickled.
+    
+    Parameters:
+        task (tuple): (shared memory name, type code, iBegin, iEnd inclusive).
+    '''
+    name, typecode, iBegin, iEnd = task
+    itemSize = TypedArray(typecode).itemsize
+    start, stop = iBegin * itemSize, (iEnd + 1) * itemSize
+    sharedMemory = shared_memory.SharedMemory(name=name)
+    try:
+        with sharedMemory.buf[start:stop] as raw, raw.cast(typecode) as view:
+            sort(view)
+    finally:
+        sharedMemory.close()
+
+
+def parallel_sort(array, processes=None, threshold=PARALLEL_THRESHOLD):
+    '''
+    Parallel quicksort for large numeric arrays.
+    The values are copied once into a shared memory buffer, the top levels are
+    partitioned serially (see _partition_shared_range()) until there are a few
+    independent sub-ranges per process, and a process pool sorts those sub-ranges
+    concurrently inside the shared buffer. The result is copied back in place.
+    Input below the threshold, or that is not plain numbers, uses sort().
+    
+    Parameters:
+        array: A list of ints or floats, a numeric array.array, or a 1-D NumPy array.
+        processes (int): Number of worker processes, defaults to the number of CPU cores.
+        threshold (int): Arrays shorter than this are sorted on a single core.
+    
+    Returns:
+        The sorted array (the same object that was passed in).
+    '''
+    processes = processes or os.cpu_count() or 1
+    typecode = _shared_typecode(array) if len(array) >= max(threshold, 2) else None
+    if typecode is None or processes < 2:
+        return sort(array)
+
+    # Copy the values into shared memory once
+    values = TypedArray(typecode, array) if isinstance(array, list) else array
+    with memoryview(values) as source:
+        byteCount = source.nbytes
+        sharedMemory = shared_memory.SharedMemory(create=True, size=byteCount)
+        sharedMemory.buf[:byteCount] = source.cast('B')
+    try:
+        with sharedMemory.buf[:byteCount].cast(typecode) as view:
+            # NaNs go to the end first and are left out of every range
+            count = _move_nans_to_end(view) if typecode in 'fd' else len(view)
+
+            # Partition the largest range until there is enough independent work
+            ranges = [(0, count - 1)]
+            while ranges and len(ranges) < processes * RANGES_PER_PROCESS:
+                ranges.sort(key=lambda bounds: bounds[1] - bounds[0])
+                iBegin, iEnd = ranges[-1]
+                if iEnd - iBegin + 1 < threshold // (processes * RANGES_PER_PROCESS):
+                    break  # Every range is already small
+                ranges.pop()
+                iLess, iGreater = _partition_shared_range(view, iBegin, iEnd)
+                ranges += [bounds for bounds in ((iBegin, iLess - 1), (iGreater + 1, iEnd))
+                           if bounds[1] > bounds[0]]
+
+            # Sort the independent ranges concurrently, largest first
+            ranges.sort(key=lambda bounds: bounds[0] - bounds[1])
+            with multiprocessing.Pool(processes) as pool:
+                pool.map(_sort_shared_range,
+                         [(sharedMemory.name, typecode, iBegin, iEnd) for iBegin, iEnd in ranges],
+                         chunksize=1)
+
+            # Copy the sorted values back into the caller's container
+            if isinstance(array, list):
+                array[:] = view.tolist()
+            else:
+                with memoryview(array) as target:
+                    target.cast('B')[:] = sharedMemory.buf[:byteCount]
+    finally:
+        sharedMemory.close()
+        sharedMemory.unlink()
+    return array
+
+
+def benchmark_parallel(size=10000000, process_counts=None):
+    '''
+    Times parallel_sort() on random floats with different numbers of processes
+    and prints the speedup over a single process.
+    
+    Parameters:
+        size (int): Number of elements to sort.
+        process_counts (list): Process counts to try, defaults to 1, 2, 4, ... up to the core count.
+    
+    Returns:
+        dict: Time in seconds, keyed by process count.
+    '''
+    cores = os.cpu_count() or 1
+    if process_counts is None:
+        process_counts = [1]
+        while process_counts[-1] * 2 <= cores:
+            process_counts.append(process_counts[-1] * 2)
+    rng = random.Random(131)
+    data = TypedArray('d', (rng.random() for _ in range(size)))
+    results = {}
+    print(f"{'processes':>9} {'time':>10} {'speedup':>8}")
+    for processes in process_counts:
+        array = TypedArray('d', data)
+        start = time.perf_counter()
+        parallel_sort(array, processes, threshold=0)
+        results[processes] = time.perf_counter() - start
+        print(f"{processes:>9} {results[processes]:>9.2f}s {results[process_counts[0]] / results[processes]:>7.2f}x")
+    return results
+
+
 def run_tests():
 
 
@@ -138,7 +682,63 @@ def run_tests():
  
     # Test Case 14: floating-point numbers 
     assert sort([10.5, 2.3, 5.7, 4.8, 1.9, 0.2, 6.3, 3.4, 2.1, 8.0, 9.5, 3.6, 7.4]) == [0.2, 1.9, 2.1, 2.3, 3.4, 3.6, 4.8, 5.7, 6.3, 7.4, 8.0, 9.5, 10.5]
+
+    # Test Case 15: organ-pipe data large enough to need partitioning and the depth limit
+    assert sort(list(range(5000)) + list(range(5000, 0, -1))) == sorted(list(range(5000)) + list(range(5000, 0, -1)))
+
+    # Test Case 16: many duplicates, deeper than the recursion limit would allow
+    assert sort([7, 3] * 5000) == [3] * 5000 + [7] * 5000
+
+    # Test Case 17: numeric containers come back sorted as the same object
+    numbers = TypedArray('d', [2.5, -1.0, 9.75, 0.0])
+    assert sort(numbers) is numbers and list(numbers) == [-1.0, 0.0, 2.5, 9.75]
+    assert sort(list(range(2000, 0, -1))) == list(range(1, 2001))
+
+    # Test Case 18: three-way partitioning gives the same results
+    assert sort([3, 1, 4, 1, 5, 9, 2], three_way=True) == [1, 1, 2, 3, 4, 5, 9]
+    assert sort([7, 3, 5] * 5000, three_way=True) == [3] * 5000 + [5] * 5000 + [7] * 5000
+
+    # Test Case 19: ints too large for NumPy keep their exact values
+    huge = [2**63 + 3, 2**63 + 1, -1] + [0] * 1000
+    assert sort(huge[:]) == sorted(huge)
+    assert sort([0.5, -1.0] * 600) == [-1.0] * 600 + [0.5] * 600
+
+    # Test Case 20: key and reverse, with each key computed only once
+    calls = []
+    records = [("pear", 3), ("fig", 1), ("kiwi", 2), ("apple", 5), ("plum", 4)] * 10
+    def count_key(record):
+        calls.append(record)
+        return record[1]
+    assert sort(records[:], key=count_key) == sorted(records, key=lambda record: record[1])
+    assert len(calls) == len(records)
+    assert sort(records[:], key=lambda record: record[0], reverse=True) == sorted(records, reverse=True)
+    assert sort([3, 1, 2], reverse=True) == [3, 2, 1]
+
+    # Test Case 21: parallel sort over shared memory, forced on with a zero threshold
+    scattered = [(i * 7919) % 10007 for i in range(20000)]
+    assert parallel_sort(scattered[:], 2, threshold=0) == sorted(scattered)
+    # NaNs (here also where the ninther samples its pivot) end up last, with the
+    # other values sorted as returned
+    withNans = [float(value) if index % 7 else float('nan') for index, value in enumerate(scattered)]
+    numbers = sorted(value for value in withNans if value == value)
+    for useNumpy in (True, False):
+        savedNumpy = globals()['np']
+        if not useNumpy:
+            globals()['np'] = None  # Also check the pure Python partition
+        try:
+            result = parallel_sort(withNans[:], 2, threshold=0)
+        finally:
+            globals()['np'] = savedNumpy
+        assert result[:len(numbers)] == numbers
+        assert all(value != value for value in result[len(numbers):])
+        assert len(result) == len(withNans)
  
     print("All test cases passed!")
 
-run_tests()
\ No newline at end of file
+# Only run when executed as a script, so parallel_sort() worker processes can import this file
+if __name__ == "__main__":
+    run_tests()
+    if "--benchmark" in sys.argv:
+        benchmark_partitions()
+    if "--benchmark-parallel" in sys.argv:
+        benchmark_parallel()
@@ -0,0 +1,348 @@
+# Sorting benchmark suite
+#      Compares sort() from segregationSort/sort.py, sublist_sort() from
+#      subList/subList.py and Python's built-in sorted() on generated inputs,
+#      recording comparisons, moves and wall time, and flags regressions
+#      against a stored baseline.
+#
+#      python sortBenchmark.py --output results.json
+#      python sortBenchmark.py --baseline results.json        (exit status 1 on a regression)
+#      python sortBenchmark.py --sizes 10 1000 10000000 --families random sorted
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+# The sort labs are single-file scripts in sibling folders
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'segregationSort'))
+sys.path.insert(0, os.path.join(ROOT, 'subList'))
+
+import sort as segregation  # noqa: E402
+import subList as sublist  # noqa: E402
+
+# Sizes from 10 up; pass --sizes to go as far as 10**7
+DEFAULT_SIZES = (10, 100, 1000, 10000, 100000)
+
+# Above this size only the time is measured; counting every comparison through
+# a wrapper object is too slow and too memory hungry for the largest inputs
+COUNT_LIMIT = 100000
+
+# A timing more than this fraction slower than the baseline is a regression ...
+DEFAULT_TOLERANCE = 0.5
+
+# ... but only if it is also this many seconds slower; short cases are all timer
+# noise, and their exact comparison and move counts catch real changes instead
+DEFAULT_TIME_FLOOR = 0.02
+
+
+# ---------------------------------------------------------------------------
+# Input families
+# ---------------------------------------------------------------------------
+
+def random_input(size, rng):
+    return [rng.randrange(size) for _ in range(size)]
+
+def sorted_input(size, rng):
+    return list(range(size))
+
+def reverse_input(size, rng):
+    return list(range(size, 0, -1))
+
+def organ_pipe_input(size, rng):
+    # Rises to the middle, then falls again: 0 1 2 ... 2 1 0
+    half = size // 2
+    return list(range(half)) + list(range(size - half - 1, -1, -1))
+
+def few_unique_input(size, rng):
+    return [rng.randrange(10) for _ in range(size)]
+
+def nearly_sorted_input(size, rng, swaps=None):
+    '''
+    Sorted input with a few random pairs swapped.
+
+    Parameters:
+        size (int): Number of elements.
+        rng (random.Random): Source of randomness.
+        swaps (int): Pairs to swap; defaults to 1% of the size (at least one).
+
+    Returns:
+        list: The nearly sorted input.
+    '''
+    data = list(range(size))
+    if size > 1:
+        for _ in range(swaps if swaps is not None else max(1, size // 100)):
+            iFirst, iSecond = rng.randrange(size), rng.randrange(size)
+            data[iFirst], data[iSecond] = data[iSecond], data[iFirst]
+    return data
+
+def median_of_3_killer_input(size, rng):
+    '''
+    Musser's median-of-3 killer sequence: with the pivot taken as the median of the
+    first, middle and last elements, every partition splits off only two elements,
+    which drives plain median-of-3 quicksort to O(n^2). sort() only uses median-of-3
+    below NINTHER_THRESHOLD elements and Tukey's ninther above it, so on larger
+    inputs it stays O(n log n) without reaching its heapsort fallback.
+
+    Parameters:
+        size (int): Number of elements.
+        rng (random.Random): Unused; kept so every family has the same signature.
+
+    Returns:
+        list: The adversarial input.
+    '''
+    # The construction needs an even half; any leftover keys go on the end in order
+    half = size // 4 * 2
+    data = [0] * (2 * half)
+    for i in range(1, half + 1):
+        # 1-indexed construction: odd positions count up, even ones hold the large keys
+        data[i - 1] = i if i % 2 else half + i - 1
+        data[half + i - 1] = 2 * i
+    return data + list(range(2 * half + 1, size + 1))
+
+FAMILIES = {
+    'random': random_input,
+    'sorted': sorted_input,
+    'reverse': reverse_input,
+    'organ-pipe': organ_pipe_input,
+    'few-unique': few_unique_input,
+    'nearly-sorted': nearly_sorted_input,
+    'median-of-3-killer': median_of_3_killer_input,
+}
+
+
+# ---------------------------------------------------------------------------
+# Instrumentation
+# ---------------------------------------------------------------------------
+
+class CountedValue:
+    '''
+    Wraps a value and counts every comparison made between wrapped values.
+    The count is kept on the class so all values share it.
+    '''
+    __slots__ = ('value',)
+    comparisons = 0
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        CountedValue.comparisons += 1
+        return self.value < other.value
+
+    def __le__(self, other):
+        CountedValue.comparisons += 1
+        return self.value <= other.value
+
+    def __gt__(self, other):
+        CountedValue.comparisons += 1
+        return self.value > other.value
+
+    def __ge__(self, other):
+        CountedValue.comparisons += 1
+        return self.value >= other.value
+
+    def __eq__(self, other):
+        CountedValue.comparisons += 1
+        return self.value == other.value
+
+    __hash__ = None
+
+
+class MoveCountingList(list):
+    '''
+    A list that counts writes into it, one per element stored (slice writes count
+    every element they store). Swaps count as two moves. sublist_sort() is given one
+    of these as its scratch buffer too, so writes into the scratch are counted as well.
+    '''
+    def __init__(self, values):
+        super().__init__(values)
+        self.moves = 0
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self.moves += len(range(*index.indices(len(self))))
+        else:
+            self.moves += 1
+        super().__setitem__(index, value)
+
+
+def run_sort_default(array):
+    segregation.sort(array)
+    return array
+
+def run_sort_three_way(array):
+    segregation.sort(array, three_way=True)
+    return array
+
+def run_sublist_sort(array, scratch=None):
+    sublist.sublist_sort(array, scratch=scratch)
+    return array
+
+def run_builtin_sorted(array):
+    return sorted(array)
+
+ALGORITHMS = {
+    'sort': run_sort_default,
+    'sort-three-way': run_sort_three_way,
+    'sublist_sort': run_sublist_sort,
+    'sorted': run_builtin_sorted,
+}
+
+
+def measure(algorithm, data, repeat, count, numpy):
+    '''
+    Runs one algorithm on one input.
+
+    Parameters:
+        algorithm (str): Key into ALGORITHMS.
+        data (list): The input; it is copied for every run.
+        repeat (int): Timed runs; the best time is kept.
+        count (bool): Also count comparisons and moves on an instrumented copy.
+        numpy (bool): Let sort() and sublist_sort() use their NumPy fast path;
+                      when False the interpreted algorithms themselves are timed.
+
+    Returns:
+        dict: seconds, comparisons and moves (None when not measured).
+    '''
+    function = ALGORITHMS[algorithm]
+    expected = sorted(data)
+    savedNumpy = segregation.np, sublist.np
+    if not numpy:
+        segregation.np = sublist.np = None
+    try:
+        best = float('inf')
+        for _ in range(repeat):
+            array = data[:]
+            start = time.perf_counter()
+            result = function(array)
+            best = min(best, time.perf_counter() - start)
+        if result != expected:
+            raise AssertionError(f"{algorithm} returned an unsorted result")
+
+        comparisons = moves = None
+        if count:
+            CountedValue.comparisons = 0
+            array = MoveCountingList(map(CountedValue, data))
+            if algorithm == 'sublist_sort':
+                # Count the merges through the scratch buffer as well as into the array
+                scratch = MoveCountingList([None] * len(data))
+                run_sublist_sort(array, scratch)
+                array.moves += scratch.moves
+            else:
+                function(array)
+            comparisons = CountedValue.comparisons
+            # sorted() builds a new list, so its moves cannot be seen from outside
+            moves = array.moves if algorithm != 'sorted' else None
+    finally:
+        segregation.np, sublist.np = savedNumpy
+
+    return {'seconds': best, 'comparisons': comparisons, 'moves': moves}
+
+
+def run_suite(sizes=DEFAULT_SIZES, families=None, algorithms=None, repeat=5,
+              countLimit=COUNT_LIMIT, numpy=False, seed=131):
+    '''
+    Benchmarks every algorithm on every input family and size.
+
+    Parameters:
+        sizes (iterable): Input lengths.
+        families (iterable): Keys into FAMILIES (all of them if None).
+        algorithms (iterable): Keys into ALGORITHMS (all of them if None).
+        repeat (int): Timed runs per case; the best time is kept.
+        countLimit (int): Largest size whose comparisons and moves are counted.
+        numpy (bool): Allow the NumPy fast paths.
+        seed (int): Seed for the random families, so inputs repeat between runs.
+
+    Returns:
+        list: One dict per case with algorithm, family, size, seconds, comparisons, moves.
+    '''
+    results = []
+    for family in families or FAMILIES:
+        for size in sizes:
+            data = FAMILIES[family](size, random.Random(f"{seed}-{family}-{size}"))
+            for algorithm in algorithms or ALGORITHMS:
+                result = measure(algorithm, data, repeat, size <= countLimit, numpy)
+                results.append({'algorithm': algorithm, 'family': family, 'size': size, **result})
+                print_result(results[-1])
+    return results
+
+
+def print_result(result):
+    comparisons = '-' if result['comparisons'] is None else result['comparisons']
+    moves = '-' if result['moves'] is None else result['moves']
+    print(f"{result['algorithm']:>14} {result['family']:>18} {result['size']:>9} "
+          f"{result['seconds']:>10.4f}s {comparisons:>12} {moves:>12}")
+
+
+def find_regressions(results, baseline, tolerance=DEFAULT_TOLERANCE, timeFloor=DEFAULT_TIME_FLOOR):
+    '''
+    Compares results with a baseline from an earlier run. A case regresses when it is
+    both more than tolerance and more than timeFloor seconds slower, or when it makes
+    more comparisons or moves (those are exact, since the inputs are seeded).
+
+    Parameters:
+        results (list): Output of run_suite().
+        baseline (list): Output of an earlier run_suite(), e.g. loaded from JSON.
+        tolerance (float): Allowed fractional slowdown in wall time.
+        timeFloor (float): Slowdowns of fewer seconds than this are ignored as noise.
+
+    Returns:
+        list: A message for each regression.
+    '''
+    previous = {(case['algorithm'], case['family'], case['size']): case for case in baseline}
+    regressions = []
+    for case in results:
+        old = previous.get((case['algorithm'], case['family'], case['size']))
+        if old is None:
+            continue
+        name = f"{case['algorithm']} on {case['family']} ({case['size']})"
+        if case['seconds'] > old['seconds'] * (1 + tolerance) and \
+                case['seconds'] - old['seconds'] > timeFloor:
+            regressions.append(f"{name}: {old['seconds']:.4f}s -> {case['seconds']:.4f}s")
+        for measurement in ('comparisons', 'moves'):
+            if case[measurement] is not None and old.get(measurement) is not None \
+                    and case[measurement] > old[measurement]:
+                regressions.append(f"{name}: {old[measurement]} -> {case[measurement]} {measurement}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the sorting labs against sorted().")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--families', nargs='+', choices=list(FAMILIES))
+    parser.add_argument('--algorithms', nargs='+', choices=list(ALGORITHMS))
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per case (best is kept)")
+    parser.add_argument('--count-limit', type=int, default=COUNT_LIMIT,
+                        help="largest size to count comparisons and moves for")
+    parser.add_argument('--numpy', action='store_true', help="allow the NumPy fast paths")
+    parser.add_argument('--output', help="write the results to this JSON file")
+    parser.add_argument('--baseline', help="JSON results of an earlier run to compare with")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--time-floor', type=float, default=DEFAULT_TIME_FLOOR,
+                        help="ignore slowdowns smaller than this many seconds")
+    args = parser.parse_args(argv)
+
+    print(f"{'algorithm':>14} {'family':>18} {'size':>9} {'time':>11} {'comparisons':>12} {'moves':>12}")
+    results = run_suite(args.sizes, args.families, args.algorithms, args.repeat,
+                        args.count_limit, args.numpy)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=1)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = find_regressions(results, json.load(file), args.tolerance, args.time_floor)
+        for regression in regressions:
+            print("REGRESSION", regression)
+        if regressions:
+            return 1
+        print("No regressions against", args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,9 +10,119 @@
 # 5. How long did it take for you to complete the assignment?
 #      Between programming, debugging, creating test cases and recording 2 hours
 
-def combine(source, destination, iBegin1, iBegin2, iEnd2):
+import heapq
+import io
+import os
+import tempfile
+import tracemalloc
+from array import array as TypedArray
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; without it every input takes the pure Python path
+    np = None
+
+# array.array type codes that hold plain numbers NumPy can sort
+NUMERIC_TYPECODES = 'bBhHiIlLqQfd'
+
+# Lists shorter than this are not worth converting to NumPy
+NUMPY_THRESHOLD = 1000
+
+# Bytes of records external_sort() holds in memory for one run
+DEFAULT_MEMORY_LIMIT = 64 * 1024 * 1024
+
+# Most run files external_sort() merges at once
+DEFAULT_FAN_IN = 64
+
+# A merge switches to galloping once one sublist wins this many times in a row
+MIN_GALLOP = 7
+
+# Natural runs shorter than the minimum run length are extended with binary insertion
+MIN_MERGE = 64
+
+def gallop(array, target, iBegin, iEnd, after, fromEnd=False):
+    '''
+    Finds where target belongs in the sorted range array[iBegin:iEnd] by exponential
+    search from iBegin (or from iEnd) followed by a binary search, so a match k places
+    in costs O(log k).
+    
+    Arguments:
+    array -- the array holding the sorted range
+    target -- the value to look for
+    iBegin -- the starting index of the range
+    iEnd -- the ending index of the range (exclusive)
+    after -- True to return the index after any elements equal to target,
+             False to return the index before them
+    fromEnd -- True to start the search at the end of the range, for merges that
+               work from the largest elements down
+    
+    Returns:
+    iFound -- the index where target would be inserted
+    '''
+    # Exponential search: probe 1, 3, 7, 15 ... places in until we pass target
+    iLow = iBegin
+    step = 1
+    if fromEnd:
+        while iLow < iEnd:
+            iProbe = max(iEnd - step, iLow)
+            if not ((target < array[iProbe]) if after else not (array[iProbe] < target)):
+                iLow = iProbe + 1
+                break
+            iEnd = iProbe
+            step *= 2
+    else:
+        while iLow < iEnd:
+            iProbe = min(iLow + step, iEnd) - 1
+            if (target < array[iProbe]) if after else not (array[iProbe] < target):
+                iEnd = iProbe
+                break
+            iLow = iProbe + 1
+            step *= 2
+    
+    # Binary search in the bracket the exponential search found
+    while iLow < iEnd:
+        iMiddle = (iLow + iEnd) // 2
+        if (target < array[iMiddle]) if after else not (array[iMiddle] < target):
+            iEnd = iMiddle
+        else:
+            iLow = iMiddle + 1
+    return iLow
+
+def copy_range(source, iSource, destination, iDestination, count):
+    '''
+    Copies count elements from source[iSource:] to destination[iDestination:] without
+    building a temporary slice. Typed storage is copied through memoryviews; lists are
+    copied element by element. The ranges may overlap when source is destination.
+    
+    Arguments:
+    source -- the array to copy from
+    iSource -- the first index copied from source
+    destination -- the array to copy into
+    iDestination -- the index the first element is copied to
+    count -- the number of elements to copy
+    '''
+    if isinstance(source, (TypedArray, memoryview)) and isinstance(destination, (TypedArray, memoryview)):
+        with memoryview(source) as sourceView, memoryview(destination) as destinationView:
+            destinationView[iDestination:iDestination + count] = sourceView[iSource:iSource + count]
+    elif source is destination and iDestination > iSource:
+        # Copy from the end so an overlapping range is not overwritten before it is read
+        for iTo, iFrom in zip(range(iDestination + count - 1, iDestination - 1, -1),
+                              range(iSource + count - 1, iSource - 1, -1)):
+            destination[iTo] = source[iFrom]
+    else:
+        for iTo, iFrom in zip(range(iDestination, iDestination + count), range(iSource, iSource + count)):
+            destination[iTo] = source[iFrom]
+
+def combine(source, destination, iBegin1, iBegin2, iEnd2, sourceValues=None, destinationValues=None,
+            first=None, firstValues=None):
     ''' 
     Merges two sorted sublists from 'source' into the 'destination' array.
+    On ties the element from the first sublist is taken, which keeps the merge stable.
+    When one sublist wins MIN_GALLOP times in a row the merge gallops: it searches
+    for the end of the winning streak and copies the whole block at once.
+    The first sublist may be kept in another array ('first'), at the same indices; then
+    destination can be source itself, and the merge writes over the first sublist's
+    place in source while the second sublist is still being read from it.
     
     Arguments:
     source -- the array containing the sublists to be merged
@@ -20,77 +130,655 @@ def combine(source, destination, iBegin1, iBegin2, iEnd2):
     iBegin1 -- the starting index of the first sorted sublist
     iBegin2 -- the starting index of the second sorted sublist
     iEnd2 -- the ending index of the second sorted sublist (exclusive)
+    sourceValues -- optional array moved in step with source (used for key= sorts)
+    destinationValues -- where the values of sourceValues are merged to
+    first -- optional array holding the first sublist instead of source
+    firstValues -- the values moved in step with first
     
     Returns:
     destination -- the array with the two merged sorted sublists
     '''
+    if first is None:
+        first, firstValues = source, sourceValues
     
     iEnd1 = iBegin2  # Set iEnd1 as the beginning of the second sublist (which is the first to merge)
+    iDestination = iBegin1
+    wins1 = wins2 = 0  # How many times in a row each sublist has won
     
-    # Iterate through the destination array, comparing elements from both sublists
-    for iDestination in range(iBegin1, iEnd2):
-        # If there are elements left in the first sublist, and (either the second sublist is exhausted 
-        # or the current element in the first sublist is smaller), we take the element from the first sublist
-        if (iBegin1 < iEnd1) and (iBegin2 == iEnd2 or source[iBegin1] < source[iBegin2]):
-            destination[iDestination] = source[iBegin1]
-            iBegin1 += 1  # Move the pointer for the first sublist
-        else:
-            destination[iDestination] = source[iBegin2]
-            iBegin2 += 1  # Move the pointer for the second sublist
+    # Merge while both sublists still have elements
+    while iBegin1 < iEnd1 and iBegin2 < iEnd2:
+        if wins1 < MIN_GALLOP and wins2 < MIN_GALLOP:
+            # Take from the first sublist unless the second one's element is smaller
+            if not source[iBegin2] < first[iBegin1]:
+                destination[iDestination] = first[iBegin1]
+                if sourceValues is not None:
+                    destinationValues[iDestination] = firstValues[iBegin1]
+                iBegin1 += 1  # Move the pointer for the first sublist
+                wins1 += 1
+                wins2 = 0
+            else:
+                destination[iDestination] = source[iBegin2]
+                if sourceValues is not None:
+                    destinationValues[iDestination] = sourceValues[iBegin2]
+                iBegin2 += 1  # Move the pointer for the second sublist
+                wins2 += 1
+                wins1 = 0
+            iDestination += 1
+            continue
+        
+        # Galloping: copy every element of the first sublist that goes before source[iBegin2]
+        iStop1 = gallop(first, source[iBegin2], iBegin1, iEnd1, True)
+        count1 = iStop1 - iBegin1
+        copy_range(first, iBegin1, destination, iDestination, count1)
+        if sourceValues is not None:
+            copy_range(firstValues, iBegin1, destinationValues, iDestination, count1)
+        iDestination += count1
+        iBegin1 = iStop1
+        if iBegin1 == iEnd1:
+            break
+        
+        # ... then every element of the second sublist that goes before first[iBegin1]
+        iStop2 = gallop(source, first[iBegin1], iBegin2, iEnd2, False)
+        count2 = iStop2 - iBegin2
+        copy_range(source, iBegin2, destination, iDestination, count2)
+        if sourceValues is not None:
+            copy_range(sourceValues, iBegin2, destinationValues, iDestination, count2)
+        iDestination += count2
+        iBegin2 = iStop2
+        
+        # Go back to one element at a time when the blocks get short
+        if count1 < MIN_GALLOP and count2 < MIN_GALLOP:
+            wins1 = wins2 = 0
+    
+    # Copy whatever is left of the sublist that was not exhausted; the rest of the
+    # second sublist is already in place when merging back into source
+    if iBegin1 < iEnd1:
+        copy_range(first, iBegin1, destination, iDestination, iEnd1 - iBegin1)
+        if sourceValues is not None:
+            copy_range(firstValues, iBegin1, destinationValues, iDestination, iEnd1 - iBegin1)
+    elif destination is not source:
+        copy_range(source, iBegin2, destination, iDestination, iEnd2 - iBegin2)
+        if sourceValues is not None:
+            copy_range(sourceValues, iBegin2, destinationValues, iDestination, iEnd2 - iBegin2)
     
     return destination  # Return the destination array with merged sublists
 
-def sublist_sort(array):
+def combine_high(array, second, iBegin1, iBegin2, iEnd2, values=None, secondValues=None):
+    '''
+    Merges two sorted sublists back into 'array', starting from their largest elements.
+    The first sublist is array[iBegin1:iBegin2]; the second one has been moved out to
+    second[iBegin2:iEnd2], so the merge can fill array from iEnd2 down without
+    overwriting anything it still has to read. Used instead of combine() when the
+    second sublist is the shorter one; it is stable and gallops the same way.
+    
+    Arguments:
+    array -- the array holding the first sublist and receiving the result
+    second -- the array holding the second sublist
+    iBegin1 -- the starting index of the first sorted sublist
+    iBegin2 -- the starting index of the second sorted sublist
+    iEnd2 -- the ending index of the second sorted sublist (exclusive)
+    values -- optional array moved in step with array (used for key= sorts)
+    secondValues -- the values moved in step with second
+    
+    Returns:
+    array -- the array with the two merged sorted sublists
+    '''
+    iEnd1 = iBegin2  # Each sublist is consumed from its end down to its beginning
+    iDestination = iEnd2
+    wins1 = wins2 = 0  # How many times in a row each sublist has won
+    
+    while iBegin1 < iEnd1 and iBegin2 < iEnd2:
+        if wins1 < MIN_GALLOP and wins2 < MIN_GALLOP:
+            # The larger element goes last; on ties the second sublist's does, which keeps the merge stable
+            iDestination -= 1
+            if second[iEnd2 - 1] < array[iEnd1 - 1]:
+                iEnd1 -= 1
+                array[iDestination] = array[iEnd1]
+                if values is not None:
+                    values[iDestination] = values[iEnd1]
+                wins1 += 1
+                wins2 = 0
+            else:
+                iEnd2 -= 1
+                array[iDestination] = second[iEnd2]
+                if values is not None:
+                    values[iDestination] = secondValues[iEnd2]
+                wins2 += 1
+                wins1 = 0
+            continue
+        
+        # Galloping: move every element of the first sublist that goes after second[iEnd2 - 1]
+        iStart1 = gallop(array, second[iEnd2 - 1], iBegin1, iEnd1, True, True)
+        count1 = iEnd1 - iStart1
+        iDestination -= count1
+        copy_range(array, iStart1, array, iDestination, count1)
+        if values is not None:
+            copy_range(values, iStart1, values, iDestination, count1)
+        iEnd1 = iStart1
+        if iEnd1 == iBegin1:
+            break
+        
+        # ... then every element of the second sublist that goes after array[iEnd1 - 1]
+        iStart2 = gallop(second, array[iEnd1 - 1], iBegin2, iEnd2, False, True)
+        count2 = iEnd2 - iStart2
+        iDestination -= count2
+        copy_range(second, iStart2, array, iDestination, count2)
+        if values is not None:
+            copy_range(secondValues, iStart2, values, iDestination, count2)
+        iEnd2 = iStart2
+        
+        # Go back to one element at a time when the blocks get short
+        if count1 < MIN_GALLOP and count2 < MIN_GALLOP:
+            wins1 = wins2 = 0
+    
+    # What is left of the first sublist is already in place; copy the rest of the second
+    count2 = iEnd2 - iBegin2
+    copy_range(second, iBegin2, array, iDestination - count2, count2)
+    if values is not None:
+        copy_range(secondValues, iBegin2, values, iDestination - count2, count2)
+    
+    return array
+
+def compute_min_run(size):
+    '''
+    Chooses the minimum run length, between MIN_MERGE/2 and MIN_MERGE, so that the
+    number of runs is a power of two or slightly less, which keeps merges balanced.
+    
+    Arguments:
+    size -- the length of the array being sorted
+    
+    Returns:
+    minRun -- the minimum run length
+    '''
+    extra = 0  # Becomes 1 if any bit shifted off is set
+    while size >= MIN_MERGE:
+        extra |= size & 1
+        size >>= 1
+    return size + extra
+
+def binary_insertion_sort(array, iBegin, iEnd, iStart, values=None):
+    '''
+    Extends the sorted range array[iBegin:iStart] to array[iBegin:iEnd], placing each new
+    element after any equal ones (so it stays stable) with a binary search.
+    
+    Arguments:
+    array -- the array being sorted
+    iBegin -- the starting index of the range
+    iEnd -- the ending index of the range (exclusive)
+    iStart -- the first index that is not sorted yet
+    values -- optional array moved in step with array (used for key= sorts)
+    '''
+    for iCurrent in range(iStart, iEnd):
+        pivot = array[iCurrent]
+        iLow, iHigh = iBegin, iCurrent
+        while iLow < iHigh:
+            iMiddle = (iLow + iHigh) // 2
+            if pivot < array[iMiddle]:
+                iHigh = iMiddle
+            else:
+                iLow = iMiddle + 1
+        # Shift the larger elements one place right with a slice and drop the pivot in
+        if iLow < iCurrent:
+            array[iLow + 1:iCurrent + 1] = array[iLow:iCurrent]
+            array[iLow] = pivot
+            if values is not None:
+                companion = values[iCurrent]
+                values[iLow + 1:iCurrent + 1] = values[iLow:iCurrent]
+                values[iLow] = companion
+
+def count_run(array, iBegin, size, values=None):
+    '''
+    Finds the natural run that starts at iBegin. A strictly descending run is
+    reversed in place (strictly, so reversing it cannot reorder equal elements).
+    
+    Arguments:
+    array -- the array being sorted
+    iBegin -- the index where the run starts
+    size -- the length of the array
+    values -- optional array moved in step with array (used for key= sorts)
+    
+    Returns:
+    iEnd -- the ending index of the run (exclusive)
+    '''
+    iEnd = iBegin + 1
+    if iEnd == size:
+        return iEnd
+    
+    if array[iEnd] < array[iBegin]:
+        # Strictly descending
+        while iEnd < size and array[iEnd] < array[iEnd - 1]:
+            iEnd += 1
+        array[iBegin:iEnd] = array[iBegin:iEnd][::-1]
+        if values is not None:
+            values[iBegin:iEnd] = values[iBegin:iEnd][::-1]
+    else:
+        # Ascending (previous element <= current element)
+        while iEnd < size and not array[iEnd] < array[iEnd - 1]:
+            iEnd += 1
+    return iEnd
+
+def vectorized_sort(array, kind):
+    '''
+    Sorts homogeneous numeric input in place with NumPy, without the interpreted loop.
+    NumPy arrays, numeric array.array objects and writable numeric memoryviews are
+    sorted directly on their buffer; lists of only ints or only floats are sorted in
+    NumPy and copied back. Keep in step with vectorized_sort() in segregationSort/sort.py.
+    
+    Arguments:
+    array -- the list, array.array, memoryview or NumPy array to sort
+    kind -- the NumPy sort algorithm to use
+    
+    Returns:
+    True if the input was sorted here, False if it needs the regular sort
+    '''
+    if np is None:
+        return False
+
+    if isinstance(array, np.ndarray):
+        if array.ndim != 1 or array.dtype.kind not in 'iuf':
+            return False
+        array.sort(kind=kind)
+        return True
+
+    if isinstance(array, TypedArray):
+        if array.typecode not in NUMERIC_TYPECODES:
+            return False
+        if len(array) > 1:
+            # A NumPy view over the array's own memory, so nothing is copied
+            np.frombuffer(array, dtype=array.typecode).sort(kind=kind)
+        return True
+
+    if isinstance(array, memoryview):
+        if array.format not in NUMERIC_TYPECODES or array.readonly or not array.c_contiguous:
+            return False
+        if len(array) > 1:
+            np.frombuffer(array, dtype=array.format).sort(kind=kind)
+        return True
+
+    if isinstance(array, list) and len(array) >= NUMPY_THRESHOLD:
+        types = set(map(type, array))
+        if types != {int} and types != {float}:
+            return False
+        values = np.array(array)
+        # Ints outside int64/uint64 come back as floats or objects, which would lose
+        # precision, so only sort here when NumPy kept the exact kind of number
+        if values.dtype.kind not in ('iu' if types == {int} else 'f'):
+            return False
+        values.sort(kind=kind)
+        array[:] = values.tolist()
+        return True
+
+    return False
+
+def make_scratch(array):
     '''
-    Sorts an array using the sublist sort method, which repeatedly merges sorted sublists.
+    Allocates a scratch buffer sublist_sort() can merge through for arrays like this one.
+    Keep it and pass it back as scratch= to sort batches of a similar size without
+    allocating anything per call.
     
     Arguments:
-    array -- the list to be sorted
+    array -- a list, array.array, memoryview or NumPy array
     
     Returns:
-    src -- the sorted array
+    scratch -- an empty buffer of the same kind and length
+    '''
+    if isinstance(array, memoryview):
+        return memoryview(bytearray(array.nbytes)).cast(array.format)
+    if np is not None and isinstance(array, np.ndarray):
+        return np.empty_like(array)
+    if isinstance(array, TypedArray):
+        return TypedArray(array.typecode, bytes(array.itemsize * len(array)))
+    return [None] * len(array)
+
+def sublist_sort(array, key=None, reverse=False, scratch=None):
     '''
+    Sorts an array using the sublist sort method, which merges sorted sublists.
+    The natural sublists (runs) are found in one pass, short ones are extended to a
+    minimum length with binary insertion, and they are kept on a stack that is merged
+    with timsort's rules, so partially sorted data sorts in close to linear time.
+    Numeric input (NumPy arrays, numeric array.array and memoryviews, large lists of
+    only ints or only floats) is sorted in place by NumPy's stable sort when it is
+    installed; without NumPy typed storage is merged directly, which moves raw
+    numbers instead of Python object references.
+    The sort is stable: elements with equal keys keep their original order,
+    also when reverse is True (the same guarantee as Python's sorted()).
+    The result is always left in the caller's array.
     
+    Arguments:
+    array -- the list, array.array or writable memoryview to be sorted
+    key -- optional function called once per element; the results are cached in a
+           list that is merged alongside the elements
+    reverse -- sort in descending order
+    scratch -- optional buffer from make_scratch(), at least as long as array, that
+               is reused for merging instead of allocating one on every call
+    
+    Returns:
+    array -- the sorted array (sorted in place)
+    '''
+    if scratch is not None and len(scratch) < len(array):
+        raise ValueError(f"scratch holds {len(scratch)} elements but the array has {len(array)}")
+    
+    if reverse:
+        # Reversing before and after a stable ascending sort keeps equal
+        # elements in their original order
+        array[:] = array[::-1]
+        sublist_sort(array, key, scratch=scratch)
+        array[:] = array[::-1]
+        return array
+    
+    if key is None and vectorized_sort(array, 'stable'):
+        return array  # Sorted in place, same container type
+    
+    _sort_runs(array, key, True, scratch)
+    return array  # Return the sorted array
+
+def _sort_runs(array, key, mergeAll, scratch=None):
+    '''
+    Finds the runs in array, extends short ones to the minimum run length and merges
+    them on a run stack with timsort's rules.
+    
+    Arguments:
+    array -- the array being sorted
+    key -- optional function giving the key each element is ordered by
+    mergeAll -- True to merge down to one run, False to leave the last few runs
+                on the stack for the caller to merge
+    scratch -- optional buffer for merging the elements of array through
+    
+    Returns:
+    keys -- the array the runs were sorted in (array itself unless key is given)
+    runs -- the (start, length) of each run left, in order
+    '''
     size = len(array)  # Get the length of the input array
-    src = array  # Assign the source array (the one to be sorted)
-    des = [None] * size  # Create a destination array to hold merged sublists
-    num = 2  # Initialize the variable to count the number of sublists (we start with two sublists)
-    
-    # Continue sorting while there are more than one sublist
-    while num > 1:
-        num = 0  # Reset the number of sublists for each round of merging
-        iBegin1 = 0  # Start from the beginning of the array
+    if size < 2:
+        return array, [(0, size)]
+    
+    # When sorting by key the cached keys are sorted and the elements follow them
+    values = None
+    src = array
+    if key is not None:
+        values = array
+        src = [key(value) for value in array]
+    
+    # Scratch buffers the shorter run of each merge is moved out to
+    if scratch is None:
+        scratch = make_scratch(array)
+    if key is None:
+        des, desValues = scratch, None
+    else:
+        des, desValues = [None] * size, scratch
+    
+    def merge_at(iRun):
+        # Merge runs iRun and iRun + 1, which sit next to each other in src
+        iBegin1, length1 = runs[iRun]
+        iBegin2, length2 = runs[iRun + 1]
+        runs[iRun] = (iBegin1, length1 + length2)
+        del runs[iRun + 1]
+        iEnd2 = iBegin2 + length2
+        
+        # Elements already in place at either end do not need to move
+        iBegin1 = gallop(src, src[iBegin2], iBegin1, iBegin2, True)
+        if iBegin1 == iBegin2:
+            return
+        iEnd2 = gallop(src, src[iBegin2 - 1], iBegin2, iEnd2, False)
+        
+        # Only the shorter run is moved out to the scratch buffer, as in timsort,
+        # and the merge writes straight back into src
+        if iBegin2 - iBegin1 <= iEnd2 - iBegin2:
+            copy_range(src, iBegin1, des, iBegin1, iBegin2 - iBegin1)
+            if values is not None:
+                copy_range(values, iBegin1, desValues, iBegin1, iBegin2 - iBegin1)
+            combine(src, src, iBegin1, iBegin2, iEnd2, values, values, des, desValues)
+        else:
+            copy_range(src, iBegin2, des, iBegin2, iEnd2 - iBegin2)
+            if values is not None:
+                copy_range(values, iBegin2, desValues, iBegin2, iEnd2 - iBegin2)
+            combine_high(src, des, iBegin1, iBegin2, iEnd2, values, desValues)
+    
+    minRun = compute_min_run(size)
+    runs = []  # Stack of (start, length) for runs not merged yet
+    iBegin = 0
+    while iBegin < size:
+        iEnd = count_run(src, iBegin, size, values)
+        
+        # Extend short runs to minRun elements
+        if iEnd - iBegin < minRun:
+            iForced = min(iBegin + minRun, size)
+            binary_insertion_sort(src, iBegin, iForced, iEnd, values)
+            iEnd = iForced
+        runs.append((iBegin, iEnd - iBegin))
         
-        # Iterate over the array and find sorted sublists
-        while iBegin1 < size:
-            iEnd1 = iBegin1 + 1  # Start by assuming a sublist of size 1 (one element)
-            
-            # Expand the sublist while it's sorted (previous element <= current element)
-            while iEnd1 < size and src[iEnd1 - 1] <= src[iEnd1]:
-                iEnd1 += 1
-            
-            iBegin2 = iEnd1  # Now, iBegin2 is where the second sublist starts
-            
-            if iBegin2 < size:
-                iEnd2 = iBegin2 + 1  # Assume a sublist of size 1 (one element)
+        # Merge until the run lengths on the stack shrink faster than Fibonacci
+        # numbers: A > B + C and B > C for the top three runs A, B, C
+        while len(runs) > 1:
+            n = len(runs) - 2
+            if (n > 0 and runs[n - 1][1] <= runs[n][1] + runs[n + 1][1]) or \
+               (n > 1 and runs[n - 2][1] <= runs[n - 1][1] + runs[n][1]):
+                if runs[n - 1][1] < runs[n + 1][1]:
+                    n -= 1
+                merge_at(n)
+            elif runs[n][1] <= runs[n + 1][1]:
+                merge_at(n)
             else:
-                iEnd2 = iBegin2  # If the second sublist is exhausted, set iEnd2 to iBegin2
-            
-            # Expand the second sublist while it's sorted
-            while iEnd2 < size and src[iEnd2 - 1] <= src[iEnd2]:
-                iEnd2 += 1
-            
-            num += 1  # Increase the number of sublists
-            
-            # Call the combine function to merge the two sublists into 'des'
-            combine(src, des, iBegin1, iBegin2, iEnd2)
-            
-            iBegin1 = iEnd2  # Move the starting index to the end of the second sublist
+                break
+        iBegin = iEnd
+    
+    # Merge everything that is left, top of the stack first
+    while mergeAll and len(runs) > 1:
+        n = len(runs) - 2
+        if n > 0 and runs[n - 1][1] < runs[n + 1][1]:
+            n -= 1
+        merge_at(n)
+    
+    return src, runs
+
+
+class _Descending:
+    '''
+    Wraps a key so that sorting or merging in ascending order puts the largest key first.
+    '''
+    __slots__ = ('key',)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+    def __eq__(self, other):
+        # Tuples compare their items with == first, so ties must be seen as equal
+        return not (self.key < other.key or other.key < self.key)
+
+def merge_sorted(*streams, key=None, reverse=False):
+    '''
+    Lazily merges any number of sorted iterables (lists, generators, open files ...)
+    through a heap holding one element per stream. Only one element of each stream is
+    read ahead, so the output can be consumed while the inputs are still being produced.
+    Ties go to the earlier stream, so merging sorted runs of one input is stable.
+    
+    Arguments:
+    streams -- the sorted iterables to merge
+    key -- optional function giving the key each element is ordered by
+    reverse -- True if the streams are sorted in descending order
+    
+    Returns:
+    generator -- yields the merged elements
+    '''
+    def order(value):
+        valueKey = value if key is None else key(value)
+        return _Descending(valueKey) if reverse else valueKey
+    
+    # Heap entries are (key, stream number, element, stream); the stream number
+    # breaks ties so the elements themselves are never compared
+    heap = []
+    for iStream, stream in enumerate(streams):
+        stream = iter(stream)
+        for value in stream:
+            heap.append((order(value), iStream, value, stream))
+            break
+    heapq.heapify(heap)
+    
+    while heap:
+        _, iStream, value, stream = heap[0]
+        yield value
+        for value in stream:
+            heapq.heapreplace(heap, (order(value), iStream, value, stream))
+            break
+        else:
+            heapq.heappop(heap)  # This stream is used up
+
+def sublist_sort_iter(array, key=None, reverse=False):
+    '''
+    Like sublist_sort(), but the last merge pass is not written to a buffer: the runs
+    left on the run stack (a handful, at most about log2 of the length) are merged
+    lazily by merge_sorted() and the elements are yielded as they are merged, so a
+    consumer can start before the sort has finished. Stable, like sublist_sort().
+    
+    Arguments:
+    array -- the list to be sorted; it is used as working storage, so afterwards it
+             holds the sorted runs rather than the fully sorted result
+    key -- optional function called once per element to get the key it is ordered by
+    reverse -- sort in descending order
+    
+    Returns:
+    generator -- yields the elements in sorted order
+    '''
+    if reverse:
+        # Sorting ascending by an inverted key keeps equal elements in their original order
+        baseKey = key
+        key = lambda value: _Descending(value if baseKey is None else baseKey(value))
+    
+    keys, runs = _sort_runs(array, key, False)
+    
+    # Each run is read in place through its indexes, without copying it
+    if key is None:
+        streams = [map(array.__getitem__, range(iBegin, iBegin + length)) for iBegin, length in runs]
+        yield from merge_sorted(*streams)
+    else:
+        # Merge the indexes on the cached keys and look the elements up as they come out
+        streams = [range(iBegin, iBegin + length) for iBegin, length in runs]
+        for index in merge_sorted(*streams, key=keys.__getitem__):
+            yield array[index]
+
+def read_records(file, recordSize=None):
+    '''
+    Reads records one at a time from an open file.
+    
+    Arguments:
+    file -- a text file (for lines) or a binary file (for fixed-width records)
+    recordSize -- None to read lines, or the width in bytes of each binary record
+    
+    Returns:
+    generator -- yields each line (always ending in a newline) or each record
+    '''
+    if recordSize is None:
+        for line in file:
+            yield line if line.endswith('\n') else line + '\n'
+        return
+    
+    while True:
+        record = file.read(recordSize)
+        if not record:
+            return
+        if len(record) < recordSize:
+            raise ValueError(f"Input ends with a partial record of {len(record)} bytes (expected {recordSize})")
+        yield record
+
+def _open_run(path, mode, recordSize, encoding, bufferSize=-1):
+    # Lines are text, fixed-width records are bytes; newline='' keeps line endings as they are
+    if recordSize is None:
+        return open(path, mode, buffering=bufferSize, encoding=encoding, newline='')
+    return open(path, mode + 'b', buffering=bufferSize)
+
+def _write_run(records, tempDir, recordSize, encoding):
+    # Writes one sorted run to a new temp file and returns its path
+    handle, path = tempfile.mkstemp(prefix='sublist-run-', dir=tempDir)
+    os.close(handle)
+    with _open_run(path, 'w', recordSize, encoding) as run:
+        run.writelines(records)
+    return path
+
+def _merge_runs(paths, destination, key, reverse, recordSize, encoding, bufferSize):
+    # k-way merges the run files at paths into the open file destination
+    runs = [_open_run(path, 'r', recordSize, encoding, bufferSize) for path in paths]
+    try:
+        streams = [read_records(run, recordSize) for run in runs]
+        destination.writelines(merge_sorted(*streams, key=key, reverse=reverse))
+    finally:
+        for run in runs:
+            run.close()
+
+def external_sort(inputPath, outputPath, memoryLimit=DEFAULT_MEMORY_LIMIT, recordSize=None,
+                  key=None, reverse=False, tempDir=None, fanIn=DEFAULT_FAN_IN, encoding='utf-8'):
+    '''
+    Sorts a file that may be larger than memory. The input is read in chunks of about
+    memoryLimit bytes, each chunk is sorted with sublist_sort() and written to a temp run
+    file, and the runs are then k-way merged through a heap with buffered reads. When
+    there are more than fanIn runs they are merged in several passes. Like sublist_sort()
+    the sort is stable.
+    
+    Arguments:
+    inputPath -- the file to sort
+    outputPath -- where the sorted file is written (may be the same as inputPath)
+    memoryLimit -- roughly how many bytes of records to hold in memory at once
+    recordSize -- None to sort lines of text, or the width in bytes of each binary record
+    key -- optional function giving the key each line or record is ordered by
+    reverse -- sort in descending order
+    tempDir -- the directory for the temp run files (the system default if None)
+    fanIn -- the most run files to merge at once
+    encoding -- the text encoding of the lines (ignored for binary records)
+    
+    Returns:
+    count -- the number of lines or records sorted
+    '''
+    if memoryLimit < 1 or fanIn < 2:
+        raise ValueError("memoryLimit must be positive and fanIn at least 2")
+    
+    paths = []
+    count = 0
+    try:
+        # Pass 1: sort chunks that fit in memory into run files
+        with _open_run(inputPath, 'r', recordSize, encoding) as source:
+            chunk = []
+            used = 0
+            for record in read_records(source, recordSize):
+                chunk.append(record)
+                used += len(record)
+                if used >= memoryLimit:
+                    paths.append(_write_run(sublist_sort(chunk, key, reverse), tempDir, recordSize, encoding))
+                    count += len(chunk)
+                    chunk = []
+                    used = 0
+            if chunk or not paths:
+                paths.append(_write_run(sublist_sort(chunk, key, reverse), tempDir, recordSize, encoding))
+                count += len(chunk)
+        
+        # Each open run gets an equal share of the memory for its read buffer
+        bufferSize = max(io.DEFAULT_BUFFER_SIZE, memoryLimit // (fanIn + 1))
         
-        # After each round, swap the source and destination arrays
-        src, des = des, src
+        # Merge passes until at most fanIn runs are left; keeping the runs in
+        # input order keeps the merge stable
+        while len(paths) > fanIn:
+            merged = []
+            for iGroup in range(0, len(paths), fanIn):
+                group = paths[iGroup:iGroup + fanIn]
+                handle, path = tempfile.mkstemp(prefix='sublist-run-', dir=tempDir)
+                os.close(handle)
+                merged.append(path)
+                with _open_run(path, 'w', recordSize, encoding, bufferSize) as destination:
+                    _merge_runs(group, destination, key, reverse, recordSize, encoding, bufferSize)
+                for done in group:
+                    os.remove(done)
+            paths = merged
+        
+        # Final pass straight into the output file
+        with _open_run(outputPath, 'w', recordSize, encoding, bufferSize) as destination:
+            _merge_runs(paths, destination, key, reverse, recordSize, encoding, bufferSize)
+    finally:
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
     
-    return src  # Return the sorted array
+    return count
 
 
 def run_tests():
@@ -139,10 +827,97 @@ def run_tests():
     # Test Case 15: Floating-point numbers
     assert sublist_sort([10.5, 2.3, 5.7, 4.8, 1.9, 0.2, 6.3, 3.4, 2.1, 8.0, 9.5, 3.6, 7.4]) == [0.2, 1.9, 2.1, 2.3, 3.4, 3.6, 4.8, 5.7, 6.3, 7.4, 8.0, 9.5, 10.5]
 
+    # Test Case 16: Numeric containers come back sorted as the same type
+    numbers = TypedArray('i', [5, -3, 8, 0, 2])
+    assert list(sublist_sort(numbers)) == [-3, 0, 2, 5, 8]
+    assert sublist_sort(list(range(2000, 0, -1))) == list(range(1, 2001))
+    huge = [2**63 + 3, 2**63 + 1, -1] + [0] * 1000  # Too large for NumPy; must keep exact values
+    assert sublist_sort(huge[:]) == sorted(huge)
+
+    # Test Case 17: Stable with key and reverse, each key computed only once
+    records = [("pear", 3), ("fig", 1), ("kiwi", 3), ("apple", 1), ("plum", 2)] * 5
+    calls = []
+    def count_key(record):
+        calls.append(record)
+        return record[1]
+    assert sublist_sort(records[:], key=count_key) == sorted(records, key=lambda record: record[1])
+    assert len(calls) == len(records)
+    assert sublist_sort(records[:], key=lambda record: record[1], reverse=True) == \
+        sorted(records, key=lambda record: record[1], reverse=True)
+    assert sublist_sort([3, 1, 2], reverse=True) == [3, 2, 1]
+
+    # Test Case 18: Long runs, galloping merges and short runs extended by insertion
+    data = list(range(0, 3000, 3)) + list(range(2999, 0, -2)) + [7, 1, 4] * 30
+    expected = sorted(data)
+    assert sublist_sort(data) == expected
+    assert combine([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 0, 11], [None] * 12, 0, 10, 12) == \
+        [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11]
+    # Merging from the top keeps equal elements of the first sublist first
+    pairs = [(1, 'a'), (2, 'a'), (2, 'b'), (3, 'a'), (2, 'c'), (3, 'b')]
+    keys = [pair[0] for pair in pairs]
+    assert combine_high(keys, keys[:], 0, 4, 6, pairs, pairs[:]) == [1, 2, 2, 2, 3, 3]
+    assert pairs == [(1, 'a'), (2, 'a'), (2, 'b'), (2, 'c'), (3, 'a'), (3, 'b')]
+    assert gallop([1, 2, 2, 2, 3], 2, 0, 5, False, True) == 1
+    assert gallop([1, 2, 2, 2, 3], 2, 0, 5, True, True) == 4
+
+    # Test Case 19: Reused scratch buffer and typed storage, result in the caller's array
+    numbers = TypedArray('d', [(n * 37) % 101 / 4 for n in range(300)])
+    expected = sorted(numbers)
+    scratch = make_scratch(numbers)
+    view = memoryview(numbers)
+    assert sublist_sort(view, scratch=memoryview(scratch)) is view
+    assert list(numbers) == expected
+    words = [str(n) for n in numbers]
+    assert sublist_sort(words, scratch=[None] * 400) == sorted(words)
+    _sort_runs(numbers, None, True, scratch)  # The pure Python path on typed storage
+    assert list(numbers) == expected
+    
+    # Merges copy only the shorter run into the scratch and no slices of the array,
+    # so with a reused scratch almost nothing is allocated
+    for numbers in (TypedArray('d', [(n * 7919) % 20011 / 4 for n in range(20000)]),
+                    [(n * 7919) % 20011 for n in range(20000)]):
+        expected = sorted(numbers)
+        scratch = make_scratch(numbers)
+        tracemalloc.start()
+        _sort_runs(numbers, None, True, scratch)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert list(numbers) == expected
+        assert peak < 20000  # A slice of the merged range would take 80000 bytes or more
+
+    # Test Case 20: Lazy k-way merge and streaming sort
+    merged = merge_sorted(iter([1, 4, 9]), (n * 2 for n in range(5)), [], [3, 3])
+    assert next(merged) == 0
+    assert list(merged) == [1, 2, 3, 3, 4, 4, 6, 8, 9]
+    assert list(merge_sorted([9, 5], [8, 5, 1], reverse=True)) == [9, 8, 5, 5, 1]
+    data = [(n * 37) % 101 for n in range(300)]
+    assert list(sublist_sort_iter(data[:])) == sorted(data)
+    assert list(sublist_sort_iter(records[:], key=lambda record: record[1], reverse=True)) == \
+        sorted(records, key=lambda record: record[1], reverse=True)
+
+    # Test Case 21: External sort of text lines and binary records in small runs
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'lines.txt')
+        lines = [f"{(n * 7919) % 1000:03d} line {n}\n" for n in range(500)]
+        with open(path, 'w', encoding='utf-8') as file:
+            file.writelines(lines)
+        assert external_sort(path, path, memoryLimit=200, fanIn=4, key=lambda line: line[:3]) == 500
+        with open(path, encoding='utf-8') as file:
+            assert file.readlines() == sorted(lines, key=lambda line: line[:3])
+        
+        path = os.path.join(folder, 'records.bin')
+        records = [bytes([n % 251, n % 7]) for n in range(300)]
+        with open(path, 'wb') as file:
+            file.write(b''.join(records))
+        external_sort(path, path, memoryLimit=64, recordSize=2, reverse=True)
+        with open(path, 'rb') as file:
+            assert file.read() == b''.join(sorted(records, reverse=True))
+
     print("All test cases passed!")
 
-# Run the tests
-run_tests()
+# Run the tests only when executed as a script, so importing this file stays quiet
+if __name__ == "__main__":
+    run_tests()
 
 
 
@@ -14,9 +14,211 @@
 
 
 
+import argparse
 import json
+import mmap
+import multiprocessing
 import os
+import random
+import struct
+import sys
+import tempfile
 import time
+from array import array
+from collections import deque
+from enum import Enum
+from itertools import islice
+from math import isqrt
+
+def cell_to_int(cell_value):
+    '''
+    Converts a raw board cell to an integer.
+    Anything that cannot be converted (blank strings, None) counts as an empty cell.
+    
+    Parameters:
+        cell_value: The value stored in the board cell.
+        
+    Returns:
+        int: The numeric value of the cell, 0 if it is empty.
+    '''
+    try:
+        return int(cell_value)
+    except (ValueError, TypeError):
+        return 0
+
+# Symbols used for cell values in puzzle lines and on boards larger than 9x9
+SYMBOLS = "123456789ABCDEFGHIJKLMNOP"
+
+def box_size_for(size):
+    '''
+    Returns the box width of an N^2 x N^2 board (3 for 9x9, 4 for 16x16, 5 for 25x25).
+    
+    Parameters:
+        size (int): Number of rows (and columns) on the board.
+        
+    Returns:
+        int: The box width, or None if size is not a supported perfect square.
+    '''
+    box_size = isqrt(size)
+    if box_size < 2 or box_size * box_size != size or size > len(SYMBOLS):
+        return None
+    return box_size
+
+class SudokuBoard:
+    '''
+    A Sudoku board of any N^2 x N^2 size (9x9, 16x16, 25x25) stored as one packed
+    array of bytes, row by row, plus an occupancy bitmask for every row, column and box.
+    Bit (value - 1) of a mask is set when that value is already used in the unit,
+    so checking or placing a move is a few bit operations no matter how big the board is.
+    Indexing the object (board[row][col]) returns a live memoryview of the row,
+    so display_board() keeps working; to_list() gives a plain list-of-lists for save_game().
+    '''
+
+    def __init__(self, grid):
+        '''
+        Packs a list-of-lists board and builds the masks once.
+        The board size is taken from the number of rows.
+        
+        Parameters:
+            grid (list): The N^2 x N^2 Sudoku board.
+        '''
+        self.size = len(grid)
+        self.box_size = box_size_for(self.size)
+        if self.box_size is None:
+            raise ValueError(f"Unsupported board size: {self.size}x{self.size}")
+        self.cells = array('B', bytes(self.size * self.size))
+        self._view = memoryview(self.cells)
+        self.row_masks = [0] * self.size
+        self.col_masks = [0] * self.size
+        self.box_masks = [0] * self.size
+        for row_index in range(self.size):
+            for col_index in range(self.size):
+                numeric_value = cell_to_int(grid[row_index][col_index])
+                if 1 <= numeric_value <= self.size:
+                    self.place(row_index, col_index, numeric_value)
+
+    @classmethod
+    def empty(cls, box_size=3):
+        '''
+        Creates a blank board whose boxes are box_size x box_size (3 gives a 9x9 board).
+        '''
+        size = box_size * box_size
+        return cls([[0] * size for _ in range(size)])
+
+    def __getitem__(self, row_index):
+        # Rows are read-only views: writing a cell without place()/clear() would leave
+        # the masks out of step with the cells
+        if row_index < 0:
+            row_index += self.size
+        if not 0 <= row_index < self.size:
+            raise IndexError("row index out of range")
+        start = row_index * self.size
+        return self._view[start:start + self.size].toreadonly()
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for row_index in range(self.size):
+            yield self[row_index]
+
+    def to_list(self):
+        '''
+        Returns the board as a plain list-of-lists of integers, 0 for empty cells.
+        '''
+        return [self.cells[row * self.size:(row + 1) * self.size].tolist() for row in range(self.size)]
+
+    def box_index(self, row_index, col_index):
+        '''
+        Returns the number of the box that holds the cell, counted left to right, top to bottom.
+        '''
+        return (row_index // self.box_size) * self.box_size + col_index // self.box_size
+
+    def is_filled(self, row_index, col_index):
+        '''
+        Returns True if the cell already holds a number.
+        '''
+        return self.cells[row_index * self.size + col_index] != 0
+
+    def conflict(self, row_index, col_index, numeric_value):
+        '''
+        Finds which unit, if any, already contains the value.
+        The units are checked in the same order is_valid_move() reports them.
+        
+        Parameters:
+            row_index (int): Row of the cell.
+            col_index (int): Column of the cell.
+            numeric_value (int): The value to place (1 to the board size).
+            
+        Returns:
+            str: 'row', 'column' or 'block' for the first conflicting unit, None if there is no conflict.
+        '''
+        bit = 1 << (numeric_value - 1)
+        if self.row_masks[row_index] & bit:
+            return 'row'
+        if self.col_masks[col_index] & bit:
+            return 'column'
+        if self.box_masks[self.box_index(row_index, col_index)] & bit:
+            return 'block'
+        return None
+
+    def conflicting_cell(self, row_index, col_index, numeric_value, unit):
+        '''
+        Finds the cell in the given unit that already holds the value.
+        Only called after conflict() reports a clash, so the scan is off the fast path.
+        
+        Parameters:
+            row_index (int): Row of the cell being checked.
+            col_index (int): Column of the cell being checked.
+            numeric_value (int): The value that clashes.
+            unit (str): 'row', 'column' or 'block', as returned by conflict().
+            
+        Returns:
+            tuple: (row_index, col_index) of the clashing cell, or None if it is not found.
+        '''
+        if unit == 'row':
+            cells = [(row_index, col) for col in range(self.size)]
+        elif unit == 'column':
+            cells = [(row, col_index) for row in range(self.size)]
+        else:
+            row_start = (row_index // self.box_size) * self.box_size
+            col_start = (col_index // self.box_size) * self.box_size
+            cells = [(row, col) for row in range(row_start, row_start + self.box_size)
+                     for col in range(col_start, col_start + self.box_size)]
+        for row, col in cells:
+            if self.cells[row * self.size + col] == numeric_value:
+                return row, col
+        return None
+
+    def can_place(self, row_index, col_index, numeric_value):
+        '''
+        Returns True if the cell is empty and the value is not used in its row, column or box.
+        '''
+        return (not self.is_filled(row_index, col_index) and
+                self.conflict(row_index, col_index, numeric_value) is None)
+
+    def place(self, row_index, col_index, numeric_value):
+        '''
+        Writes the value into the cell and marks it in the three masks.
+        The caller is expected to have checked the move first.
+        '''
+        bit = 1 << (numeric_value - 1)
+        self.cells[row_index * self.size + col_index] = numeric_value
+        self.row_masks[row_index] |= bit
+        self.col_masks[col_index] |= bit
+        self.box_masks[self.box_index(row_index, col_index)] |= bit
+
+    def clear(self, row_index, col_index):
+        '''
+        Empties a cell and removes its value from the three masks.
+        '''
+        numeric_value = self.cells[row_index * self.size + col_index]
+        if numeric_value:
+            bit = ~(1 << (numeric_value - 1))
+            self.row_masks[row_index] &= bit
+            self.col_masks[col_index] &= bit
+            self.box_masks[self.box_index(row_index, col_index)] &= bit
+        self.cells[row_index * self.size + col_index] = 0
 
 def display_instructions():
     '''
@@ -41,12 +243,12 @@ def load_game(difficulty):
         difficulty (str): The difficulty level chosen by the user.
         
     Returns:
-        list: The 9x9 Sudoku board if file is found, else None.
+        SudokuBoard: The Sudoku board with its masks built if file is found, else None.
     '''
     try:
         with open(f"sudoku/{difficulty}.json", 'r') as file:
             data = json.load(file)  # Parse the JSON data
-        return data['board']  # Return the board from the file
+        return SudokuBoard(data['board'])  # Build the masks once for the loaded board
     except FileNotFoundError:
         print(f"Error: {difficulty}.json not found.")
         return None  # Indicate the game couldn't be loaded
@@ -58,9 +260,11 @@ def save_game(difficulty, board):
     
     Parameters:
         difficulty (str): The difficulty level used to name the file.
-        board (list): The current 9x9 Sudoku board.
+        board (list or SudokuBoard): The current Sudoku board.
     '''
     file_name = f"sudoku/{difficulty}.json"  # Ensure consistency with load_game()
+    if isinstance(board, SudokuBoard):
+        board = board.to_list()  # Save the plain list-of-lists form
     data = {'board': board}  # Structure data correctly
     
     try:
@@ -70,55 +274,72 @@ def save_game(difficulty, board):
     except IOError:
         print("Error saving the game. Please try again.")
 
-def display_board(board):
+def render_board(board):
     '''
-    Displays the current Sudoku board in a readable format.
+    Builds the text of the current Sudoku board in a readable format.
     Converts each cell to an integer before checking if it is zero.
-    If a cell’s integer value is zero, a blank space is printed;
-    otherwise, the number is shown.
+    If a cell’s integer value is zero, a blank space is shown;
+    otherwise, the number is shown. Works for any N^2 x N^2 board size.
     
     Parameters:
-        board (list): The current 9x9 Sudoku board.
+        board (list or SudokuBoard): The current Sudoku board.
+        
+    Returns:
+        str: The whole board, ready to be written in one call.
     '''
-    # Print column headers
-    print("\n   A B C  D E F   G H I")
+    size = len(board)
+    box_size = box_size_for(size)
+    width = len(str(size))  # Every cell and row number is padded to this width
+    margin = " " * (width + 1)
+
+    # Column headers, one letter per column grouped by box
+    groups = [" ".join(chr(ord('A') + col_index).rjust(width)
+                       for col_index in range(start, start + box_size))
+              for start in range(0, size, box_size)]
+    lines = ["", margin + "   ".join(groups)]
+    separator = margin + "-+-".join("-" * len(group) for group in groups)
     
-    # Iterate over each row (0 to 8)
-    for row_index in range(9):
-        # Print a horizontal separator after every 3 rows (except the first)
-        if row_index % 3 == 0 and row_index != 0:
-            print("   -----+-----+-----")
+    # Iterate over each row
+    for row_index in range(size):
+        # Add a horizontal separator after every box of rows (except the first)
+        if row_index % box_size == 0 and row_index != 0:
+            lines.append(separator)
         
         # Start building the display string for the row with the row number (1-indexed)
-        row_display = [str(row_index + 1)]
+        row_display = [str(row_index + 1).rjust(width)]
         
-        # Iterate over each column (0 to 8)
-        for col_index in range(9):
-            # Add a vertical separator after every 3 columns (except the first)
-            if col_index % 3 == 0 and col_index != 0:
+        # Iterate over each column
+        for col_index in range(size):
+            # Add a vertical separator after every box of columns (except the first)
+            if col_index % box_size == 0 and col_index != 0:
                 row_display.append("|")
             # Convert the cell value to an integer before comparison.
-            cell_value = board[row_index][col_index]
-            try:
-                numeric_value = int(cell_value)
-            except (ValueError, TypeError):
-                numeric_value = 0  # Default to 0 if conversion fails
+            numeric_value = cell_to_int(board[row_index][col_index])
             
             # Append the number if nonzero; otherwise, append a blank space
             if numeric_value != 0:
-                row_display.append(str(numeric_value))
+                row_display.append(str(numeric_value).rjust(width))
             else:
-                row_display.append(" ")
+                row_display.append(" " * width)
         
-        # Print the assembled row
-        print(" ".join(row_display))
-    print()  # Add a final blank line for neatness
+        lines.append(" ".join(row_display))
+    lines.append("")  # Add a final blank line for neatness
+    return "\n".join(lines) + "\n"
+
+def display_board(board):
+    '''
+    Displays the current Sudoku board, written to the screen in a single call.
+    
+    Parameters:
+        board (list or SudokuBoard): The current Sudoku board.
+    '''
+    sys.stdout.write(render_board(board))
 
 def format_cord(coordinate):
     '''
     Formats the coordinate so it is consistent throughout the program.
-    Converts the input to uppercase and, if in "DigitLetter" format (e.g., "1A"),
-    swaps the order to "A1".
+    Converts the input to uppercase and, if in "DigitLetter" format (e.g., "1A" or "12A"),
+    swaps the order to "A1" / "A12".
     
     Parameters:
         coordinate (str): The coordinate input by the user.
@@ -128,74 +349,171 @@ def format_cord(coordinate):
     '''
     coordinate = coordinate.strip().upper()
     # If coordinate is in 'DigitLetter' format, swap to 'LetterDigit'
-    if len(coordinate) >= 2 and coordinate[0].isdigit() and coordinate[1].isalpha():
-        coordinate = coordinate[1] + coordinate[0]  # Swap "1A" -> "A1"
+    digit_count = len(coordinate) - len(coordinate.lstrip("0123456789"))
+    if 0 < digit_count < len(coordinate) and coordinate[digit_count].isalpha():
+        coordinate = coordinate[digit_count:] + coordinate[:digit_count]  # Swap "1A" -> "A1"
     return coordinate
 
-def is_valid_move(board, coordinate, value):
-    """
-    Validates the user's move.
+def parse_cord(coordinate, size=9):
+    '''
+    Converts a coordinate such as "G5" (or "P16" on a 16x16 board) into board indices.
+    
+    Parameters:
+        coordinate (str): The coordinate input by the user.
+        size (int): Number of rows and columns on the board.
+        
+    Returns:
+        tuple: (row_index, col_index), or None if the coordinate is malformed or off the board.
+    '''
+    coordinate = format_cord(coordinate)
+    if len(coordinate) < 2 or not (coordinate[0].isalpha() and coordinate[1:].isdigit()):
+        return None
+    row_index = int(coordinate[1:]) - 1
+    col_index = ord(coordinate[0]) - ord('A')
+    if not (0 <= row_index < size and 0 <= col_index < size):
+        return None
+    return row_index, col_index
+
+class MoveStatus(Enum):
+    '''
+    The result of checking a move. The values double as short reason codes.
+    '''
+    VALID = 'valid'
+    BAD_COORDINATE = 'coordinate'
+    BAD_VALUE = 'value'
+    FILLED = 'filled'
+    ROW_CONFLICT = 'row'
+    COLUMN_CONFLICT = 'column'
+    BLOCK_CONFLICT = 'block'
+
+# Messages shown to the player for each rejected move
+MOVE_MESSAGES = {
+    MoveStatus.BAD_COORDINATE: "Invalid input: Coordinate format is incorrect.",
+    MoveStatus.BAD_VALUE: "Invalid number: Must be between 1 and {size}.",
+    MoveStatus.FILLED: "That position is already filled. Choose another.",
+    MoveStatus.ROW_CONFLICT: "Invalid move: Number already exists in the row.",
+    MoveStatus.COLUMN_CONFLICT: "Invalid move: Number already exists in the column.",
+    MoveStatus.BLOCK_CONFLICT: "Invalid move: Number already exists in the {box_size}x{box_size} block.",
+}
+
+def _list_conflict(board, row_index, col_index, numeric_value):
+    '''
+    Scans only the row, column and block of one cell of a plain list board, so checking
+    a move does not have to build a SudokuBoard and all of its masks first.
+    
+    Parameters:
+        board (list): The current Sudoku board as a list of rows.
+        row_index (int): Row of the cell.
+        col_index (int): Column of the cell.
+        numeric_value (int): The value to place.
+        
+    Returns:
+        tuple: (status, cell) for the first conflict in row, column, block order,
+               or None if there is no conflict.
+    '''
+    row = board[row_index]
+    if numeric_value in row:
+        return MoveStatus.ROW_CONFLICT, (row_index, row.index(numeric_value))
+    for row_number, line in enumerate(board):
+        if line[col_index] == numeric_value:
+            return MoveStatus.COLUMN_CONFLICT, (row_number, col_index)
+    box_size = box_size_for(len(board))
+    row_start = (row_index // box_size) * box_size
+    col_start = (col_index // box_size) * box_size
+    for row_number in range(row_start, row_start + box_size):
+        line = board[row_number]
+        for col_number in range(col_start, col_start + box_size):
+            if line[col_number] == numeric_value:
+                return MoveStatus.BLOCK_CONFLICT, (row_number, col_number)
+    return None
+
+def check_move(board, coordinate, value):
+    '''
+    Checks a move without printing anything, for solvers, generators and batch callers.
     Checks the coordinate format, ensures the cell is empty,
     and confirms that placing the value adheres to Sudoku rules.
     
     Parameters:
-        board (list): The current 9x9 Sudoku board.
+        board (list or SudokuBoard): The current Sudoku board. A SudokuBoard is checked with its
+                                     masks; a plain list board by scanning the cell's units.
         coordinate (str): The coordinate where the move is to be made.
         value (str): The value to be placed at the coordinate.
         
     Returns:
-        bool: True if the move is valid, False otherwise.
-    """
-    coordinate = format_cord(coordinate)
-    # Ensure the coordinate is in the format of a letter (A-I) and a digit (1-9)
-    if len(coordinate) != 2 or not (coordinate[0].isalpha() and coordinate[1].isdigit()):
-        print("Invalid input: Coordinate format is incorrect.")
-        return False
+        tuple: (status, cell) where status is a MoveStatus and cell is the (row_index, col_index)
+               that caused the rejection (the filled cell itself, or the cell already holding
+               the value), or None if there is no such cell.
+    '''
+    packed = isinstance(board, SudokuBoard)
+    size = len(board)
 
-    # Convert coordinate to board indices
-    row_index = int(coordinate[1]) - 1
-    col_index = ord(coordinate[0]) - ord('A')
-    
-    # Check if the provided value is a digit between 1 and 9
-    if not value.isdigit() or not (1 <= int(value) <= 9):
-        print("Invalid number: Must be between 1 and 9.")
-        return False
-    
+    # Ensure the coordinate is a column letter and a row number that are on the board
+    indices = parse_cord(coordinate, size)
+    if indices is None:
+        return MoveStatus.BAD_COORDINATE, None
+    row_index, col_index = indices
+
+    # Check if the provided value is a number between 1 and the board size
+    if not value.isdigit() or not (1 <= int(value) <= size):
+        return MoveStatus.BAD_VALUE, None
     numeric_value = int(value)
-    
+
     # Check if the cell is already occupied
-    if board[row_index][col_index] != 0:
-        print("That position is already filled. Choose another.")
-        return False
+    if board.is_filled(row_index, col_index) if packed else board[row_index][col_index] != 0:
+        return MoveStatus.FILLED, indices
 
-    # Check for duplicate in the row
-    if numeric_value in board[row_index]:
-        print("Invalid move: Number already exists in the row.")
-        return False
+    if not packed:
+        # Scan just this cell's row, column and block
+        return _list_conflict(board, row_index, col_index, numeric_value) or (MoveStatus.VALID, None)
 
-    # Check for duplicate in the column
-    for current_row in range(9):
-        if board[current_row][col_index] == numeric_value:
-            print("Invalid move: Number already exists in the column.")
-            return False
+    # Check the row, column and block masks for a duplicate
+    conflict = board.conflict(row_index, col_index, numeric_value)
+    if conflict is None:
+        return MoveStatus.VALID, None
+    # The unit names 'row', 'column' and 'block' are also the MoveStatus values
+    return (MoveStatus(conflict),
+            board.conflicting_cell(row_index, col_index, numeric_value, conflict))
 
-    # Determine the 3x3 block and check for duplicates within it
-    block_row_start = (row_index // 3) * 3
-    block_col_start = (col_index // 3) * 3
-    for block_row in range(block_row_start, block_row_start + 3):
-        for block_col in range(block_col_start, block_col_start + 3):
-            if board[block_row][block_col] == numeric_value:
-                print("Invalid move: Number already exists in the 3x3 block.")
-                return False
+def move_message(status, board):
+    '''
+    Formats the message shown to the player for a move status.
+    
+    Parameters:
+        status (MoveStatus): The result from check_move().
+        board (list or SudokuBoard): The board the move was checked against.
+        
+    Returns:
+        str: The message, or an empty string for a valid move.
+    '''
+    size = len(board)
+    return MOVE_MESSAGES.get(status, "").format(size=size, box_size=box_size_for(size))
 
+def is_valid_move(board, coordinate, value):
+    """
+    Validates the user's move and prints the reason when it is rejected.
+    Uses check_move(), so the rules live in one place.
+    
+    Parameters:
+        board (list or SudokuBoard): The current Sudoku board.
+        coordinate (str): The coordinate where the move is to be made.
+        value (str): The value to be placed at the coordinate.
+        
+    Returns:
+        bool: True if the move is valid, False otherwise.
+    """
+    status, _ = check_move(board, coordinate, value)
+    if status is not MoveStatus.VALID:
+        print(move_message(status, board))
+        return False
     return True  # Move passes all checks
 
 def update_board(board, coordinate, value):
     '''
     Updates the board with the player's move if the move is valid.
+    The masks of a SudokuBoard are updated along with its cells.
     
     Parameters:
-        board (list): The current 9x9 Sudoku board.
+        board (list or SudokuBoard): The current Sudoku board.
         coordinate (str): The coordinate where the move is to be made.
         value (str): The value to be placed at the coordinate.
         
@@ -203,30 +521,992 @@ def update_board(board, coordinate, value):
         bool: True if the board was updated (move is valid), False otherwise.
     '''
     if is_valid_move(board, coordinate, value):
-        formatted_coord = format_cord(coordinate)
-        row_index = int(formatted_coord[1]) - 1
-        col_index = ord(formatted_coord[0]) - ord('A')
-        board[row_index][col_index] = int(value)  # Update the board cell with the numeric value
+        row_index, col_index = parse_cord(coordinate, len(board))
+        if isinstance(board, SudokuBoard):
+            board.place(row_index, col_index, int(value))  # Update the board cell and its masks
+        else:
+            board[row_index][col_index] = int(value)  # A plain list board has no masks to keep
         return True
     else:
         return False
 
-def play_game(board, difficulty):
+def read_moves(file_name):
+    '''
+    Streams moves from a move log, one "coordinate value" pair per line (e.g. "G5 3").
+    Blank lines and lines starting with '#' are skipped.
+    
+    Parameters:
+        file_name (str): Path to the move log.
+        
+    Yields:
+        tuple: (coordinate, value) as strings.
+    '''
+    with open(file_name, 'r') as file:
+        for line in file:
+            parts = line.split()
+            if parts and not parts[0].startswith('#'):
+                yield parts[0], parts[1] if len(parts) > 1 else ""
+
+def replay_moves(board, moves):
+    '''
+    Applies a stream of moves to a board without any terminal I/O.
+    Each move goes through format_cord() and check_move() as in play_game(), and an
+    accepted move is placed straight away, so every move is validated exactly once and
+    this doubles as an end-to-end benchmark of a session.
+    
+    Parameters:
+        board (list or SudokuBoard): The starting board. A SudokuBoard is changed in place;
+                                     a plain list board is copied into one first.
+        moves: A move log file name, or an iterable of (coordinate, value) pairs.
+        
+    Returns:
+        dict: 'moves' replayed, 'accepted' count, 'rejected' counts keyed by MoveStatus
+              reason code ('coordinate', 'value', 'filled', 'row', 'column', 'block'),
+              'seconds', 'moves_per_second' and the final 'board' as a list-of-lists.
+    '''
+    if isinstance(moves, str):
+        moves = read_moves(moves)
+    packed = board if isinstance(board, SudokuBoard) else SudokuBoard(board)
+    move_count = 0
+    accepted = 0
+    rejected = {}
+    valid = MoveStatus.VALID
+
+    start_time = time.perf_counter()
+    for coordinate, value in moves:
+        move_count += 1
+        coordinate = format_cord(coordinate)
+        value = str(value).strip()
+        status, _ = check_move(packed, coordinate, value)
+        if status is valid:
+            # Already validated, so place it without going through update_board() again
+            row_index, col_index = parse_cord(coordinate, packed.size)
+            packed.place(row_index, col_index, int(value))
+            accepted += 1
+        else:
+            rejected[status] = rejected.get(status, 0) + 1
+    seconds = time.perf_counter() - start_time
+
+    return {
+        'moves': move_count,
+        'accepted': accepted,
+        'rejected': {status.value: count for status, count in rejected.items()},
+        'seconds': seconds,
+        'moves_per_second': move_count / seconds if seconds > 0 else 0.0,
+        'board': packed.to_list(),
+    }
+
+# Lookup tables shared by the solver, built once per board size.
+# Cells are numbered 0 to size*size - 1, left to right, top to bottom.
+_GEOMETRY_CACHE = {}
+
+def board_geometry(size):
+    '''
+    Returns the solver lookup tables for an N^2 x N^2 board, building them the first time.
+    
+    Parameters:
+        size (int): Number of rows and columns on the board (9, 16 or 25).
+        
+    Returns:
+        tuple: (size, all_digits, cell_row, cell_col, cell_box, units) where all_digits has one
+               bit set per value and units lists the cells of every row, column and box.
+    '''
+    if size not in _GEOMETRY_CACHE:
+        box_size = box_size_for(size)
+        if box_size is None:
+            raise ValueError(f"Unsupported board size: {size}x{size}")
+        cell_count = size * size
+        cell_row = [cell // size for cell in range(cell_count)]
+        cell_col = [cell % size for cell in range(cell_count)]
+        cell_box = [(cell_row[cell] // box_size) * box_size + cell_col[cell] // box_size
+                    for cell in range(cell_count)]
+        units = ([[row * size + col for col in range(size)] for row in range(size)] +
+                 [[row * size + col for row in range(size)] for col in range(size)] +
+                 [[cell for cell in range(cell_count) if cell_box[cell] == box] for box in range(size)])
+        _GEOMETRY_CACHE[size] = (size, (1 << size) - 1, cell_row, cell_col, cell_box, units)
+    return _GEOMETRY_CACHE[size]
+
+def _build_state(board):
+    '''
+    Flattens a board into the solver state: a flat list of cell values and the
+    row, column and box masks.
+    
+    Parameters:
+        board (list or SudokuBoard): The Sudoku board.
+        
+    Returns:
+        list: [values, row_masks, col_masks, box_masks], or None if the clues already break a rule.
+    '''
+    size, _, cell_row, cell_col, cell_box, _ = board_geometry(len(board))
+    values = [0] * (size * size)
+    row_masks = [0] * size
+    col_masks = [0] * size
+    box_masks = [0] * size
+    for cell in range(size * size):
+        numeric_value = cell_to_int(board[cell_row[cell]][cell_col[cell]])
+        if 1 <= numeric_value <= size:
+            bit = 1 << (numeric_value - 1)
+            row, col, box = cell_row[cell], cell_col[cell], cell_box[cell]
+            if (row_masks[row] | col_masks[col] | box_masks[box]) & bit:
+                return None  # Two clues with the same value share a unit
+            values[cell] = numeric_value
+            row_masks[row] |= bit
+            col_masks[col] |= bit
+            box_masks[box] |= bit
+    return [values, row_masks, col_masks, box_masks]
+
+def _propagate(state, geometry, stats, use_hidden_singles=True):
+    '''
+    Fills in every forced cell until nothing changes.
+    A naked single is a cell with only one candidate left; a hidden single is a
+    value that fits in only one cell of a row, column or box.
+    
+    Parameters:
+        state (list): The solver state built by _build_state(), changed in place.
+        geometry (tuple): The lookup tables from board_geometry().
+        stats (dict): Search statistics, 'propagation_passes' is increased once per pass.
+        use_hidden_singles (bool): False to fill naked singles only (used to grade puzzles).
+        
+    Returns:
+        bool: False if the state has reached a contradiction, True otherwise.
+    '''
+    values, row_masks, col_masks, box_masks = state
+    size, all_digits, cell_row, cell_col, cell_box, units = geometry
+    changed = True
+    while changed:
+        changed = False
+        stats['propagation_passes'] += 1
+
+        # Naked singles: cells with exactly one candidate
+        for cell in range(size * size):
+            if values[cell] == 0:
+                row, col, box = cell_row[cell], cell_col[cell], cell_box[cell]
+                candidates = all_digits & ~(row_masks[row] | col_masks[col] | box_masks[box])
+                if candidates == 0:
+                    return False
+                if candidates & (candidates - 1) == 0:
+                    values[cell] = candidates.bit_length()
+                    row_masks[row] |= candidates
+                    col_masks[col] |= candidates
+                    box_masks[box] |= candidates
+                    changed = True
+
+        if not use_hidden_singles:
+            continue
+
+        # Hidden singles: values that have only one possible cell in a unit
+        for unit in units:
+            seen_once = 0
+            seen_more = 0
+            placed = 0
+            for cell in unit:
+                if values[cell]:
+                    placed |= 1 << (values[cell] - 1)
+                else:
+                    candidates = all_digits & ~(row_masks[cell_row[cell]] |
+                                                col_masks[cell_col[cell]] |
+                                                box_masks[cell_box[cell]])
+                    seen_more |= seen_once & candidates
+                    seen_once |= candidates
+            if (seen_once | placed) != all_digits:
+                return False  # Some value has nowhere left to go in this unit
+            hidden = seen_once & ~seen_more & ~placed
+            if hidden:
+                for cell in unit:
+                    if values[cell] == 0:
+                        row, col, box = cell_row[cell], cell_col[cell], cell_box[cell]
+                        bit = hidden & ~(row_masks[row] | col_masks[col] | box_masks[box])
+                        if bit:
+                            if bit & (bit - 1):
+                                return False  # One cell is the only home for two values
+                            values[cell] = bit.bit_length()
+                            row_masks[row] |= bit
+                            col_masks[col] |= bit
+                            box_masks[box] |= bit
+                            changed = True
+    return True
+
+def _search(state, geometry, stats):
+    '''
+    Propagates, then guesses on the most constrained empty cell (fewest candidates)
+    and recurses on a copy of the state for each candidate.
+    Solutions are produced lazily, so taking the first one solves the board and
+    taking two checks whether it is unique.
+    
+    Parameters:
+        state (list): The solver state built by _build_state().
+        geometry (tuple): The lookup tables from board_geometry().
+        stats (dict): Search statistics updated as the search runs.
+        
+    Yields:
+        list: The solved cell values of each solution in this branch.
+    '''
+    if not _propagate(state, geometry, stats):
+        return
+    values, row_masks, col_masks, box_masks = state
+    size, all_digits, cell_row, cell_col, cell_box, _ = geometry
+
+    # Pick the empty cell with the fewest candidates
+    best_cell = -1
+    best_candidates = 0
+    best_count = size + 1
+    for cell in range(size * size):
+        if values[cell] == 0:
+            candidates = all_digits & ~(row_masks[cell_row[cell]] |
+                                        col_masks[cell_col[cell]] |
+                                        box_masks[cell_box[cell]])
+            count = bin(candidates).count('1')
+            if count < best_count:
+                best_cell = cell
+                best_candidates = candidates
+                best_count = count
+                if best_count == 2:
+                    break  # Propagation leaves no singles, so two is the best possible
+    if best_cell < 0:
+        yield values  # No empty cells left, the board is solved
+        return
+
+    row, col, box = cell_row[best_cell], cell_col[best_cell], cell_box[best_cell]
+    while best_candidates:
+        bit = best_candidates & -best_candidates  # Lowest remaining candidate
+        best_candidates ^= bit
+        stats['nodes'] += 1
+        child = [values[:], row_masks[:], col_masks[:], box_masks[:]]
+        child[0][best_cell] = bit.bit_length()
+        child[1][row] |= bit
+        child[2][col] |= bit
+        child[3][box] |= bit
+        found = False
+        for solution in _search(child, geometry, stats):
+            found = True
+            yield solution
+        if not found:
+            stats['backtracks'] += 1
+
+class DancingLinks:
+    '''
+    Knuth's Algorithm X for exact cover, using Dancing Links.
+    The circular doubly linked lists are stored in flat integer lists (left, right, up,
+    down, column) indexed by node number, which is much faster in Python than node objects.
+    Node 0 is the root and nodes 1..column_count are the column headers.
+    '''
+
+    def __init__(self, column_count):
+        '''
+        Creates an empty matrix with the given number of columns.
+        
+        Parameters:
+            column_count (int): Number of constraints that must each be covered exactly once.
+        '''
+        header_count = column_count + 1
+        self.left = [index - 1 for index in range(header_count)]
+        self.right = [index + 1 for index in range(header_count)]
+        self.left[0] = column_count
+        self.right[column_count] = 0
+        self.up = list(range(header_count))
+        self.down = list(range(header_count))
+        self.column = list(range(header_count))
+        self.size = [0] * header_count
+        self.row_id = [None] * header_count
+
+    def add_row(self, row_id, columns):
+        '''
+        Adds a row that covers the given columns.
+        
+        Parameters:
+            row_id: Any value returned in solutions to identify this row.
+            columns (list): Column numbers (1..column_count) that the row covers.
+        '''
+        first = len(self.column)
+        for offset, col in enumerate(columns):
+            node = first + offset
+            # Link vertically at the bottom of the column
+            self.up.append(self.up[col])
+            self.down.append(col)
+            self.down[self.up[col]] = node
+            self.up[col] = node
+            # Link horizontally into the row's ring
+            self.left.append(node - 1 if offset else first + len(columns) - 1)
+            self.right.append(node + 1 if offset < len(columns) - 1 else first)
+            self.column.append(col)
+            self.row_id.append(row_id)
+            self.size[col] += 1
+
+    def cover(self, col):
+        '''
+        Removes a column and every row that uses it from the matrix.
+        '''
+        left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+        right[left[col]] = right[col]
+        left[right[col]] = left[col]
+        row = down[col]
+        while row != col:
+            node = right[row]
+            while node != row:
+                down[up[node]] = down[node]
+                up[down[node]] = up[node]
+                size[column[node]] -= 1
+                node = right[node]
+            row = down[row]
+
+    def uncover(self, col):
+        '''
+        Puts back a column removed by cover(), in exactly the reverse order.
+        '''
+        left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+        row = up[col]
+        while row != col:
+            node = left[row]
+            while node != row:
+                size[column[node]] += 1
+                down[up[node]] = node
+                up[down[node]] = node
+                node = left[node]
+            row = up[row]
+        right[left[col]] = col
+        left[right[col]] = col
+
+    def search(self, limit, stats):
+        '''
+        Finds exact covers, stopping as soon as 'limit' of them have been found.
+        
+        Parameters:
+            limit (int): Maximum number of solutions to look for.
+            stats (dict): Search statistics, 'nodes' and 'backtracks' are updated.
+            
+        Returns:
+            tuple: (count, first) where count is the number of solutions found (at most limit)
+                   and first is the list of row ids of the first solution, or None.
+        '''
+        found = {'count': 0, 'first': None}
+        self._search([], limit, found, stats)
+        return found['count'], found['first']
+
+    def _search(self, partial, limit, found, stats):
+        right, down, size = self.right, self.down, self.size
+        if right[0] == 0:
+            # Every column is covered, so the chosen rows are a solution
+            found['count'] += 1
+            if found['first'] is None:
+                found['first'] = [self.row_id[node] for node in partial]
+            return found['count'] >= limit
+
+        # Branch on the column with the fewest rows left
+        best = right[0]
+        col = right[best]
+        while col != 0:
+            if size[col] < size[best]:
+                best = col
+            col = right[col]
+        if size[best] == 0:
+            return False
+
+        self.cover(best)
+        done = False
+        row = down[best]
+        while row != best and not done:
+            stats['nodes'] += 1
+            partial.append(row)
+            node = right[row]
+            while node != row:
+                self.cover(self.column[node])
+                node = right[node]
+            done = self._search(partial, limit, found, stats)
+            node = self.left[row]
+            while node != row:
+                self.uncover(self.column[node])
+                node = self.left[node]
+            partial.pop()
+            if not done:
+                stats['backtracks'] += 1
+            row = down[row]
+        self.uncover(best)
+        return done
+
+def _sudoku_exact_cover(board):
+    '''
+    Builds the Sudoku exact cover matrix: four groups of size*size columns (cell filled,
+    value in row, value in column, value in box) and one row per (row, column, value)
+    placement. A clue only gets the row for its own value, so clues are forced straight away.
+    
+    Parameters:
+        board (list or SudokuBoard): The Sudoku board.
+        
+    Returns:
+        DancingLinks: The matrix, with row ids of (cell, value).
+    '''
+    size, _, cell_row, cell_col, cell_box, _ = board_geometry(len(board))
+    cell_count = size * size
+    matrix = DancingLinks(4 * cell_count)
+    for cell in range(cell_count):
+        row, col, box = cell_row[cell], cell_col[cell], cell_box[cell]
+        clue = cell_to_int(board[row][col])
+        for numeric_value in ([clue] if 1 <= clue <= size else range(1, size + 1)):
+            digit = numeric_value - 1
+            matrix.add_row((cell, numeric_value),
+                           [1 + cell,
+                            1 + cell_count + row * size + digit,
+                            1 + 2 * cell_count + col * size + digit,
+                            1 + 3 * cell_count + box * size + digit])
+    return matrix
+
+SOLVER_BACKENDS = ('propagation', 'dlx')
+
+def count_solutions(board, limit=2, backend='dlx'):
+    '''
+    Counts the solutions of a board, stopping early at 'limit'.
+    With the default limit of 2 this answers "does the puzzle have exactly one solution?"
+    without enumerating the rest.
+    
+    Parameters:
+        board (list or SudokuBoard): The Sudoku board, 0 for empty cells.
+        limit (int): Stop counting once this many solutions are found.
+        backend (str): 'dlx' (Dancing Links) or 'propagation'.
+        
+    Returns:
+        int: The number of solutions found, never more than limit.
+    '''
+    if backend not in SOLVER_BACKENDS:
+        raise ValueError(f"Unknown solver backend: {backend}")
+    stats = {'nodes': 0, 'backtracks': 0, 'propagation_passes': 0}
+    if backend == 'dlx':
+        count, _ = _sudoku_exact_cover(board).search(limit, stats)
+        return count
+    state = _build_state(board)
+    if state is None:
+        return 0
+    return sum(1 for _ in islice(_search(state, board_geometry(len(board)), stats), limit))
+
+
+def solve(board, backend='propagation'):
+    '''
+    Solves a Sudoku board of any N^2 x N^2 size. The board passed in is not changed.
+    The 'propagation' backend uses constraint propagation (naked and hidden singles)
+    and most-constrained-cell backtracking over candidate bitmasks; the 'dlx' backend
+    solves it as an exact cover problem with Dancing Links.
+    
+    Parameters:
+        board (list or SudokuBoard): The Sudoku board, 0 for empty cells.
+        backend (str): 'propagation' or 'dlx'.
+        
+    Returns:
+        tuple: (solution, stats) where solution is a solved list-of-lists board or
+               None if the board has no solution, and stats is a dict with the number of
+               search 'nodes', 'backtracks' and 'propagation_passes'.
+    '''
+    if backend not in SOLVER_BACKENDS:
+        raise ValueError(f"Unknown solver backend: {backend}")
+    stats = {'nodes': 0, 'backtracks': 0, 'propagation_passes': 0}
+    geometry = board_geometry(len(board))
+    size = geometry[0]
+
+    if backend == 'dlx':
+        _, placements = _sudoku_exact_cover(board).search(1, stats)
+        if placements is None:
+            return None, stats
+        values = [0] * (size * size)
+        for cell, numeric_value in placements:
+            values[cell] = numeric_value
+    else:
+        state = _build_state(board)
+        values = next(_search(state, geometry, stats), None) if state is not None else None
+        if values is None:
+            return None, stats
+    return [values[row * size:(row + 1) * size] for row in range(size)], stats
+
+def benchmark_backends(repeat=20):
+    '''
+    Times every solver backend on the bundled Easy, Medium and Hard puzzles and prints a table.
+    
+    Parameters:
+        repeat (int): How many times each puzzle is solved per backend; the best time is kept.
+        
+    Returns:
+        dict: Best time in milliseconds, keyed by (difficulty, backend).
+    '''
+    results = {}
+    print(f"{'Puzzle':<8}" + "".join(f"{backend:>14}" for backend in SOLVER_BACKENDS))
+    for difficulty in ("Easy", "Medium", "Hard"):
+        try:
+            with open(f"sudoku/{difficulty}.json", 'r') as file:
+                board = json.load(file)['board']
+        except FileNotFoundError:
+            print(f"Error: {difficulty}.json not found.")
+            continue
+        row_display = f"{difficulty:<8}"
+        for backend in SOLVER_BACKENDS:
+            best = float('inf')
+            for _ in range(repeat):
+                start_time = time.perf_counter()
+                solve(board, backend)
+                best = min(best, time.perf_counter() - start_time)
+            results[(difficulty, backend)] = best * 1000
+            row_display += f"{best * 1000:>11.3f} ms"
+        print(row_display)
+    return results
+
+DIFFICULTIES = ('Easy', 'Medium', 'Hard')
+
+def _grade_state(state, geometry):
+    '''
+    Grades a solver state by the techniques needed to finish it.
+    
+    Returns:
+        int: 0 if naked singles solve it, 1 if hidden singles are also needed,
+             2 if guessing is needed (or the state is broken).
+    '''
+    stats = {'nodes': 0, 'backtracks': 0, 'propagation_passes': 0}
+    state = [part[:] for part in state]
+    if not _propagate(state, geometry, stats, use_hidden_singles=False):
+        return 2
+    if 0 not in state[0]:
+        return 0
+    if not _propagate(state, geometry, stats):
+        return 2
+    return 1 if 0 not in state[0] else 2
+
+def grade_puzzle(board):
+    '''
+    Grades a puzzle by which solving techniques it needs:
+    'Easy' if naked singles alone solve it, 'Medium' if hidden singles are also needed,
+    and 'Hard' if the solver has to guess.
+    
+    Parameters:
+        board (list or SudokuBoard): The Sudoku board, 0 for empty cells.
+        
+    Returns:
+        str: 'Easy', 'Medium' or 'Hard', or None if the clues break a rule.
+    '''
+    state = _build_state(board)
+    if state is None:
+        return None
+    return DIFFICULTIES[_grade_state(state, board_geometry(len(board)))]
+
+def _random_full_grid(box_size, rng):
+    '''
+    Builds a random solved board: the boxes on the main diagonal do not share any
+    row or column, so they are filled with random permutations and the solver finishes the rest.
+    '''
+    size = box_size * box_size
+    grid = [[0] * size for _ in range(size)]
+    for box in range(box_size):
+        values = list(range(1, size + 1))
+        rng.shuffle(values)
+        for offset, numeric_value in enumerate(values):
+            grid[box * box_size + offset // box_size][box * box_size + offset % box_size] = numeric_value
+    return solve(grid)[0]
+
+def generate_puzzle(difficulty='Easy', box_size=3, seed=None, attempts=20):
+    '''
+    Generates a new puzzle with exactly one solution at the requested difficulty.
+    Starts from a random solved board and removes clues in random order, putting a clue
+    back if removing it would allow a second solution or make the puzzle harder than asked.
+    A puzzle that singles can solve is already known to be unique, so the slower
+    solution count only runs once guessing is needed.
+    
+    Parameters:
+        difficulty (str): 'Easy', 'Medium' or 'Hard', as graded by grade_puzzle().
+        box_size (int): Box width, 3 for a 9x9 board.
+        seed (int): Seed for the random number generator, for repeatable puzzles.
+        attempts (int): Fresh grids to try before settling for the closest grade.
+        
+    Returns:
+        list: The puzzle as a list-of-lists board, 0 for empty cells.
+    '''
+    if difficulty not in DIFFICULTIES:
+        raise ValueError(f"Unknown difficulty: {difficulty}")
+    target = DIFFICULTIES.index(difficulty)
+    rng = random.Random(seed)
+    size = box_size * box_size
+    geometry = board_geometry(size)
+    best_puzzle = None
+    best_grade = -1
+
+    for _ in range(attempts):
+        puzzle = _random_full_grid(box_size, rng)
+        state = _build_state(puzzle)
+        cells = list(range(size * size))
+        rng.shuffle(cells)
+        grade = 0
+        for cell in cells:
+            row, col = divmod(cell, size)
+            numeric_value = puzzle[row][col]
+            bit = ~(1 << (numeric_value - 1))
+            box = geometry[4][cell]
+            # Remove the clue from the board and the solver state together
+            puzzle[row][col] = 0
+            state[0][cell] = 0
+            state[1][row] &= bit
+            state[2][col] &= bit
+            state[3][box] &= bit
+            new_grade = _grade_state(state, geometry)
+            if new_grade > target or (new_grade == 2 and count_solutions(puzzle, 2, 'propagation') != 1):
+                # Put the clue back
+                puzzle[row][col] = numeric_value
+                state[0][cell] = numeric_value
+                state[1][row] |= ~bit
+                state[2][col] |= ~bit
+                state[3][box] |= ~bit
+            else:
+                grade = new_grade
+        if grade == target:
+            return puzzle
+        if grade > best_grade:
+            best_puzzle, best_grade = puzzle, grade
+    return best_puzzle
+
+def parse_puzzle(line):
+    '''
+    Converts a puzzle line into a board. The length of the line sets the board size
+    (81 characters for 9x9, 256 for 16x16, 625 for 25x25).
+    The symbols 1-9 then A-P are clues; '0' or '.' mark an empty cell.
+    
+    Parameters:
+        line (str): The puzzle, one character per cell, row by row.
+        
+    Returns:
+        list: The board, or None if the line is not a valid puzzle.
+    '''
+    line = line.strip().upper()
+    size = isqrt(len(line))
+    if size * size != len(line) or box_size_for(size) is None:
+        return None
+    values = []
+    for char in line:
+        if char in '.0':
+            values.append(0)
+        elif char in SYMBOLS[:size]:
+            values.append(SYMBOLS.index(char) + 1)
+        else:
+            return None
+    return [values[row * size:(row + 1) * size] for row in range(size)]
+
+def format_puzzle(board):
+    '''
+    Converts a board into a puzzle line, one symbol per cell and '0' for empty cells.
+    '''
+    size = len(board)
+    return ''.join(SYMBOLS[cell_to_int(board[row][col]) - 1] if cell_to_int(board[row][col]) else '0'
+                   for row in range(size) for col in range(size))
+
+def read_puzzles(file_name):
+    '''
+    Streams puzzle lines from a file one at a time, so the file is never fully in memory.
+    Blank lines and lines starting with '#' are skipped.
+    
+    Parameters:
+        file_name (str): Path to a file with one puzzle per line.
+        
+    Yields:
+        str: Each puzzle line without its newline.
+    '''
+    with open(file_name, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
+
+def _solve_chunk(lines, backend='propagation'):
+    '''
+    Worker function for solve_batch(). Solves a list of puzzle lines in order.
+    
+    Parameters:
+        lines (list): Puzzle lines to solve.
+        backend (str): The solver backend passed to solve().
+        
+    Returns:
+        list: One solution line per puzzle, 'unsolvable' if it has no solution,
+              or 'invalid' if the line is not a puzzle.
+    '''
+    results = []
+    for line in lines:
+        board = parse_puzzle(line)
+        if board is None:
+            results.append("invalid")
+            continue
+        solution = solve(board, backend)[0]
+        results.append(format_puzzle(solution) if solution is not None else "unsolvable")
+    return results
+
+def _chunks(iterable, chunk_size):
+    '''
+    Groups an iterable into lists of chunk_size items without reading ahead further than that.
+    '''
+    iterator = iter(iterable)
+    while (chunk := list(islice(iterator, chunk_size))):
+        yield chunk
+
+def solve_batch(input_file, output_file, processes=None, chunk_size=1000, backend='propagation'):
+    '''
+    Solves every puzzle in a line-oriented puzzle file using a pool of worker processes.
+    Puzzles are streamed in chunks and at most two chunks per worker are in flight,
+    so memory use does not grow with the file size; solutions are written in the
+    same order as the input.
+    
+    Parameters:
+        input_file (str): Path to a file with one puzzle per line.
+        output_file (str): Path where one solution line per puzzle is written.
+        processes (int): Number of worker processes, defaults to the number of CPU cores.
+        chunk_size (int): Number of puzzles sent to a worker at a time.
+        backend (str): The solver backend passed to solve().
+        
+    Returns:
+        dict: 'puzzles' attempted, 'unsolvable' and 'invalid' line counts,
+              'seconds' taken and 'puzzles_per_second'.
+    '''
+    start_time = time.perf_counter()
+    puzzle_count = 0
+    unsolvable = 0
+    invalid = 0
+    in_flight_limit = 2 * (processes or os.cpu_count() or 1)
+
+    def write_oldest():
+        nonlocal puzzle_count, unsolvable, invalid
+        results = pending.popleft().get()
+        puzzle_count += len(results)
+        unsolvable += results.count("unsolvable")
+        invalid += results.count("invalid")
+        file.write("\n".join(results) + "\n")
+
+    with multiprocessing.Pool(processes) as pool, open(output_file, 'w') as file:
+        # Chunks are queued in input order and written oldest first; a new chunk is only
+        # read once a slot is free, unlike imap(), which reads the whole input ahead
+        pending = deque()
+        for chunk in _chunks(read_puzzles(input_file), chunk_size):
+            if len(pending) >= in_flight_limit:
+                write_oldest()
+            pending.append(pool.apply_async(_solve_chunk, (chunk, backend)))
+        while pending:
+            write_oldest()
+
+    seconds = time.perf_counter() - start_time
+    return {
+        'puzzles': puzzle_count,
+        'unsolvable': unsolvable,
+        'invalid': invalid,
+        'seconds': seconds,
+        'puzzles_per_second': puzzle_count / seconds if seconds > 0 else 0.0,
+    }
+
+def benchmark_batch(input_file, max_processes=None, chunk_size=1000, backend='propagation'):
+    '''
+    Solves the same puzzle file with 1, 2, 4, ... worker processes and prints the
+    throughput and speedup of each, to check how solve_batch() scales with cores.
+    
+    Parameters:
+        input_file (str): Path to a file with one puzzle per line.
+        max_processes (int): Most workers to try, defaults to the number of CPU cores.
+        chunk_size (int): Number of puzzles sent to a worker at a time.
+        backend (str): The solver backend passed to solve().
+        
+    Returns:
+        dict: puzzles_per_second keyed by the number of processes.
+    '''
+    max_processes = max_processes or os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= max_processes:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_processes:
+        counts.append(max_processes)
+
+    results = {}
+    print(f"{'Processes':>9} {'puzzles/s':>12} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as folder:
+        output_file = os.path.join(folder, 'solutions.txt')
+        for processes in counts:
+            report = solve_batch(input_file, output_file, processes, chunk_size, backend)
+            results[processes] = report['puzzles_per_second']
+            print(f"{processes:>9} {results[processes]:>12.0f} {results[processes] / results[1]:>7.2f}x")
+    return results
+
+# Every byte value split into its high and low 4-bit cells, used to unpack stored puzzles
+_NIBBLE_PAIRS = [(byte >> 4, byte & 0x0F) for byte in range(256)]
+
+class PuzzleStore:
+    '''
+    A compact binary file of Sudoku boards that is read through mmap.
+    The file starts with a 16-byte header (magic, version, board size, puzzle count)
+    followed by fixed-size records, so puzzle N is found by arithmetic and nothing is
+    parsed until it is read. Boards up to 15x15 use 4 bits per cell (41 bytes for 9x9);
+    larger boards use one byte per cell. New boards are appended to the end of the file
+    and only the count in the header is rewritten.
+    '''
+    MAGIC = b'SDKP'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHHQ')
+
+    def __init__(self, file_name, size=9):
+        '''
+        Opens a puzzle store, creating an empty one if the file does not exist.
+        
+        Parameters:
+            file_name (str): Path to the store file.
+            size (int): Board size used when a new store is created.
+        '''
+        if not os.path.exists(file_name):
+            if box_size_for(size) is None:
+                raise ValueError(f"Unsupported board size: {size}x{size}")
+            with open(file_name, 'wb') as file:
+                file.write(self.HEADER.pack(self.MAGIC, self.VERSION, size, 0))
+
+        self.file = open(file_name, 'r+b')
+        header = self.file.read(self.HEADER.size)
+        if len(header) < self.HEADER.size:
+            self.file.close()
+            raise ValueError(f"{file_name} is not a puzzle store.")
+        magic, version, self.size, self.count = self.HEADER.unpack(header)
+        if magic != self.MAGIC or version != self.VERSION or box_size_for(self.size) is None:
+            self.file.close()
+            raise ValueError(f"{file_name} is not a puzzle store.")
+        self.cell_count = self.size * self.size
+        self.packed = self.size < 16  # Two cells per byte when every value fits in 4 bits
+        self.record_size = (self.cell_count + 1) // 2 if self.packed else self.cell_count
+        self._map = None
+
+        # A store cut short would otherwise fail later, part way through reading a record
+        if os.fstat(self.file.fileno()).st_size < self.HEADER.size + self.count * self.record_size:
+            self.file.close()
+            raise ValueError(f"{file_name} is truncated: it should hold {self.count} puzzles.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        '''
+        Closes the memory map and the file.
+        '''
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self.file.close()
+
+    def _mapping(self):
+        '''
+        Returns a read-only memory map covering every record, remapping after appends.
+        '''
+        needed = self.HEADER.size + self.count * self.record_size
+        if self._map is None or len(self._map) < needed:
+            if self._map is not None:
+                self._map.close()
+            self.file.flush()
+            self._map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def __getitem__(self, index):
+        '''
+        Reads puzzle number 'index' straight out of the memory map.
+        
+        Parameters:
+            index (int): Position of the puzzle in the store (negative counts from the end).
+            
+        Returns:
+            list: The board as a list-of-lists, 0 for empty cells.
+        '''
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("puzzle index out of range")
+        offset = self.HEADER.size + index * self.record_size
+        record = self._mapping()[offset:offset + self.record_size]
+        if self.packed:
+            values = [cell for byte in record for cell in _NIBBLE_PAIRS[byte]][:self.cell_count]
+        else:
+            values = list(record)
+        return [values[row * self.size:(row + 1) * self.size] for row in range(self.size)]
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def append(self, board):
+        '''
+        Adds a board to the end of the store without rewriting the existing records.
+        
+        Parameters:
+            board (list or SudokuBoard): A board the same size as the store.
+            
+        Returns:
+            int: The index of the new puzzle.
+        '''
+        if len(board) != self.size:
+            raise ValueError(f"Board is {len(board)}x{len(board)}, store holds {self.size}x{self.size}.")
+        values = [cell_to_int(board[row][col]) for row in range(self.size) for col in range(self.size)]
+        for cell, value in enumerate(values):
+            if not 0 <= value <= self.size:
+                row, col = divmod(cell, self.size)
+                raise ValueError(f"Cell at row {row + 1}, column {col + 1} holds {value}; "
+                                 f"a {self.size}x{self.size} board needs 0-{self.size}.")
+        if self.packed:
+            values.append(0)  # Padding for an odd number of cells
+            record = bytes((values[cell] << 4) | values[cell + 1] for cell in range(0, self.cell_count, 2))
+        else:
+            record = bytes(values)
+
+        self.file.seek(self.HEADER.size + self.count * self.record_size)
+        self.file.write(record)
+        self.count += 1
+        self.file.seek(0)
+        self.file.write(self.HEADER.pack(self.MAGIC, self.VERSION, self.size, self.count))
+        return self.count - 1
+
+    def import_json(self, file_name):
+        '''
+        Appends the board from a JSON file in the Easy/Medium/Hard.json format.
+        
+        Parameters:
+            file_name (str): Path to a JSON file with a 'board' key.
+            
+        Returns:
+            int: The index of the imported puzzle.
+        '''
+        with open(file_name, 'r') as file:
+            return self.append(json.load(file)['board'])
+
+    def export_json(self, index, file_name):
+        '''
+        Writes one stored puzzle as a JSON file in the same format save_game() uses.
+        
+        Parameters:
+            index (int): Position of the puzzle in the store.
+            file_name (str): Path of the JSON file to write.
+        '''
+        with open(file_name, 'w') as file:
+            json.dump({'board': self[index]}, file, indent=4)
+
+# ANSI escape code that clears the terminal and moves the cursor to the top left
+ANSI_CLEAR = "\033[2J\033[H"
+
+def play_game(board, difficulty, fast=False):
     '''
     Main game loop where the user interacts with the Sudoku board.
     Continues until the user decides to quit.
+    In fast mode there are no pauses, the screen is cleared with an ANSI escape code
+    instead of a 'cls' shell, and each frame (feedback plus board) is written in one call.
     
     Parameters:
-        board (list): The current 9x9 Sudoku board.
+        board (SudokuBoard): The current Sudoku board.
         difficulty (str): The current game difficulty used for saving.
+        fast (bool): True to skip the interactive pacing.
         
     Returns:
         bool: True if the game was ended by quitting.
     '''
     game_running = True  # Flag to control the game loop
+    message = ""  # Feedback shown at the top of the next frame in fast mode
 
     while game_running:
-        display_board(board)  # Display the current board state
+        if fast:
+            sys.stdout.write(ANSI_CLEAR + (message + "\n" if message else "") + render_board(board))
+            sys.stdout.flush()
+            message = ""
+        else:
+            display_board(board)  # Display the current board state
         user_input = input("Enter coordinate 'Example: G5' or 'Q' to quit: ").strip()
         
         # Check if the user wants to quit immediately
@@ -237,28 +1517,32 @@ def play_game(board, difficulty):
         else:
             # Format and validate the coordinate input
             formatted_coord = format_cord(user_input)
-            is_coord_valid = (len(formatted_coord) == 2 and 
-                              formatted_coord[0].isalpha() and 
-                              formatted_coord[1].isdigit())
+            is_coord_valid = parse_cord(formatted_coord, len(board)) is not None
             
             if is_coord_valid:
                 # Get the value to be placed at the coordinate
                 cell_value = input("Enter value 'Example 6': ").strip()
-                os.system('cls')  # Clear the screen for a fresh display
-                if update_board(board, formatted_coord, cell_value):
-                    os.system('cls')  # Clear screen after a successful move
-                    print("Move accepted!")
-                    time.sleep(2)  # Pause for user to see confirmation
-                    os.system('cls')
+                if not fast:
+                    os.system('cls')  # Clear the screen for a fresh display
+                status, _ = check_move(board, formatted_coord, cell_value)
+                if status is MoveStatus.VALID:
+                    # Already validated, so place it without going through update_board() again
+                    row_index, col_index = parse_cord(formatted_coord, board.size)
+                    board.place(row_index, col_index, int(cell_value))
+                    if not fast:
+                        os.system('cls')  # Clear screen after a successful move
+                    message = "Move accepted!"
                 else:
-                    print("Try again.")
-                    time.sleep(2)
-                    os.system('cls')
+                    message = move_message(status, board) + "\nTry again."
             else:
                 # If the coordinate format is invalid, display an error message
-                print("Error: Invalid Coordinate.")
-                time.sleep(2)
+                message = "Error: Invalid Coordinate."
+
+            if not fast:
+                print(message)
+                time.sleep(2)  # Pause for user to see the message
                 os.system('cls')
+                message = ""
     # Game loop ended because the user quit
     return True  # Indicate that the game was ended by quitting
 
@@ -284,7 +1568,15 @@ def test_is_valid_move():
         ("Duplicate in row", 
          # Create a board with a 5 in the first cell of row 1.
          [[5] + [0]*8] + [[0]*9 for _ in range(8)],
-         "B1", "5", False)
+         "B1", "5", False),
+        # 5. Duplicate in column, checked through the masks.
+        ("Duplicate in column",
+         SudokuBoard([[0]*9 for _ in range(8)] + [[0]*8 + [7]]),
+         "I1", "7", False),
+        # 6. Duplicate in 3x3 block, checked through the masks.
+        ("Duplicate in 3x3 block",
+         SudokuBoard([[0]*9, [0]*4 + [2] + [0]*4] + [[0]*9 for _ in range(7)]),
+         "F3", "2", False)
     ]
     
     passed = 0
@@ -298,13 +1590,284 @@ def test_is_valid_move():
         else:
             print(f"FAIL: {desc} (Input: {coord} {val}). Expected {expected}, got {result}")
             failed += 1
+
+    # check_move() reports the reason and the clashing cell without printing
+    silent_tests = [
+        ("Bad coordinate code", tests[1][1], "11", "5", (MoveStatus.BAD_COORDINATE, None)),
+        ("Column conflict code and cell", tests[4][1], "I1", "7", (MoveStatus.COLUMN_CONFLICT, (8, 8))),
+        ("Block conflict code and cell", tests[5][1], "F3", "2", (MoveStatus.BLOCK_CONFLICT, (1, 4))),
+    ]
+    for desc, board, coord, val, expected in silent_tests:
+        result = check_move(board, coord, val)
+        if result == expected:
+            print(f"PASS: {desc} (Input: {coord} {val})")
+            passed += 1
+        else:
+            print(f"FAIL: {desc} (Input: {coord} {val}). Expected {expected}, got {result}")
+            failed += 1
+
+    # Rows handed out by a SudokuBoard are read-only, so the masks stay in step with the cells
+    packed_board = SudokuBoard.empty()
+    packed_board.place(8, 0, 4)
+    list_board = [[0] * 9 for _ in range(9)]
+    try:
+        packed_board[0][0] = 5
+        row_write_refused = False
+    except TypeError:
+        row_write_refused = True
+    board_tests = [
+        ("Board rows are read-only", row_write_refused and check_move(packed_board, "B1", "5")[0] is MoveStatus.VALID),
+        ("Negative row index is the last row", list(packed_board[-1]) == [4] + [0] * 8),
+        ("update_board() writes a plain list board", update_board(list_board, "C2", "6") and list_board[1][2] == 6),
+        ("update_board() keeps a SudokuBoard's masks", update_board(packed_board, "B1", "5")
+         and check_move(packed_board, "B2", "5")[0] is MoveStatus.COLUMN_CONFLICT),
+    ]
+    for desc, result in board_tests:
+        if result:
+            print(f"PASS: {desc}")
+            passed += 1
+        else:
+            print(f"FAIL: {desc}")
+            failed += 1
             
     print(f"\nTest Summary: {passed} passed, {failed} failed.\n")
 
+def test_replay_moves():
+    """
+    Minimal tests for read_moves() and replay_moves().
+    A small move log must give the right rejected-by-reason counts and final board.
+    """
+    print("Running minimal test cases for replay_moves()...\n")
+    passed = 0
+    failed = 0
+
+    with tempfile.TemporaryDirectory() as folder:
+        log_name = os.path.join(folder, 'moves.txt')
+        with open(log_name, 'w') as file:
+            file.write("# a short session\n"
+                       "A1 5\n"      # accepted
+                       "a1 6\n"      # filled (lower case still parses)
+                       "B1 5\n"      # row conflict
+                       "A2 5\n"      # column conflict
+                       "B2 5\n"      # block conflict
+                       "Z9 1\n"      # bad coordinate
+                       "C3 0\n"      # bad value
+                       "\n"
+                       "2C 7\n")     # accepted (swapped coordinate)
+        moves = list(read_moves(log_name))
+        report = replay_moves([[0]*9 for _ in range(9)], log_name)
+
+    expected_board = [[5] + [0]*8, [0, 0, 7] + [0]*6] + [[0]*9 for _ in range(7)]
+    tests = [
+        ("read_moves() skips comments and blank lines", len(moves) == 8 and moves[0] == ("A1", "5")),
+        ("Every move is counted", report['moves'] == 8 and report['accepted'] == 2),
+        ("Rejected moves are counted by reason", report['rejected'] == {
+            'filled': 1, 'row': 1, 'column': 1, 'block': 1, 'coordinate': 1, 'value': 1}),
+        ("Final board holds only the accepted moves", report['board'] == expected_board),
+    ]
+    for desc, result in tests:
+        if result:
+            print(f"PASS: {desc}")
+            passed += 1
+        else:
+            print(f"FAIL: {desc}")
+            failed += 1
+
+    print(f"\nTest Summary: {passed} passed, {failed} failed.\n")
+
+def test_puzzle_store():
+    """
+    Minimal tests for PuzzleStore.
+    A board must survive import_json(), append(), closing and reopening, reading
+    back by index and export_json() unchanged; bad cell values and short or
+    truncated files must be refused.
+    """
+    print("Running minimal test cases for PuzzleStore...\n")
+    passed = 0
+    failed = 0
+
+    with tempfile.TemporaryDirectory() as folder:
+        store_name = os.path.join(folder, 'puzzles.sdk')
+        with open("sudoku/Hard.json", 'r') as file:
+            hard = json.load(file)['board']
+        generated = generate_puzzle('Easy', seed=7)
+
+        with PuzzleStore(store_name) as store:
+            store.import_json("sudoku/Hard.json")
+            store.append(generated)
+            try:
+                store.append([[10] + [0]*8] + [[0]*9 for _ in range(8)])
+                bad_value_refused = False
+            except ValueError:
+                bad_value_refused = True
+
+        export_name = os.path.join(folder, 'exported.json')
+        with PuzzleStore(store_name) as store:
+            reopened = (len(store), store[0], store[-1])
+            store.export_json(0, export_name)
+        with open(export_name, 'r') as file:
+            exported = json.load(file)['board']
+
+        # A file too short for the header, and a store missing part of its last record
+        short_name = os.path.join(folder, 'short.sdk')
+        with open(short_name, 'wb') as file:
+            file.write(PuzzleStore.MAGIC)
+        with open(store_name, 'rb') as file:
+            truncated_name = os.path.join(folder, 'truncated.sdk')
+            with open(truncated_name, 'wb') as truncated:
+                truncated.write(file.read()[:-1])
+        broken_refused = []
+        for broken_name in (short_name, truncated_name):
+            try:
+                PuzzleStore(broken_name).close()
+                broken_refused.append(False)
+            except ValueError:
+                broken_refused.append(True)
 
-def main():
+    tests = [
+        ("Reopened store keeps its count", reopened[0] == 2),
+        ("Imported board reads back unchanged", reopened[1] == hard),
+        ("Appended board reads back unchanged", reopened[2] == [list(row) for row in generated]),
+        ("Exported JSON matches the original", exported == hard),
+        ("Out-of-range cell value is refused", bad_value_refused),
+        ("File too short for a header is refused", broken_refused[0]),
+        ("Truncated store is refused", broken_refused[1]),
+    ]
+    for desc, result in tests:
+        if result:
+            print(f"PASS: {desc}")
+            passed += 1
+        else:
+            print(f"FAIL: {desc}")
+            failed += 1
+
+    print(f"\nTest Summary: {passed} passed, {failed} failed.\n")
+
+def test_batch():
+    """
+    Minimal tests for read_puzzles() and solve_batch().
+    Solutions must come back in input order, one per puzzle line, with unsolvable
+    puzzles and unreadable lines reported separately.
+    """
+    print("Running minimal test cases for read_puzzles() and solve_batch()...\n")
+    passed = 0
+    failed = 0
+
+    puzzles = [format_puzzle(generate_puzzle('Easy', seed=seed)) for seed in range(5)]
+    unsolvable = "11" + "0" * 79
+    lines = puzzles[:2] + ["# a comment", "", unsolvable, "not a puzzle"] + puzzles[2:]
+
+    with tempfile.TemporaryDirectory() as folder:
+        input_name = os.path.join(folder, 'puzzles.txt')
+        output_name = os.path.join(folder, 'solutions.txt')
+        with open(input_name, 'w') as file:
+            file.write("\n".join(lines) + "\n")
+        read_back = list(read_puzzles(input_name))
+        # A chunk size of 1 and one worker keeps more chunks queued than can be in flight
+        report = solve_batch(input_name, output_name, processes=1, chunk_size=1)
+        with open(output_name, 'r') as file:
+            solutions = file.read().splitlines()
+
+    expected = [format_puzzle(solve(parse_puzzle(line))[0]) for line in puzzles]
+    tests = [
+        ("read_puzzles() skips blank and comment lines", read_back == puzzles[:2] + [unsolvable, "not a puzzle"] + puzzles[2:]),
+        ("One output line per puzzle line", len(solutions) == 7 and report['puzzles'] == 7),
+        ("Solutions keep the input order", solutions[:2] + solutions[4:] == expected),
+        ("Unsolvable puzzle is reported as unsolvable", solutions[2] == "unsolvable" and report['unsolvable'] == 1),
+        ("Unreadable line is reported as invalid", solutions[3] == "invalid" and report['invalid'] == 1),
+    ]
+    for desc, result in tests:
+        if result:
+            print(f"PASS: {desc}")
+            passed += 1
+        else:
+            print(f"FAIL: {desc}")
+            failed += 1
+
+    print(f"\nTest Summary: {passed} passed, {failed} failed.\n")
+
+def test_solve():
+    """
+    Minimal tests for the solve() function.
+    Each bundled puzzle must come back fully solved without changing any clue,
+    and a board whose clues already conflict must have no solution.
+    """
+    print("Running minimal test cases for solve()...\n")
+    passed = 0
+    failed = 0
+
+    for difficulty in ("Easy", "Medium", "Hard"):
+        try:
+            with open(f"sudoku/{difficulty}.json", 'r') as file:
+                board = json.load(file)['board']
+        except FileNotFoundError:
+            print(f"SKIP: {difficulty}.json not found.")
+            continue
+        solution, stats = solve(board)
+        is_solved = (solution is not None and
+                     all(mask == 0x1FF for mask in _build_state(solution)[1]) and
+                     all(board[row][col] in (0, solution[row][col])
+                         for row in range(9) for col in range(9)))
+        if is_solved:
+            print(f"PASS: Solve {difficulty} ({stats['nodes']} nodes, {stats['backtracks']} backtracks)")
+            passed += 1
+        else:
+            print(f"FAIL: Solve {difficulty}")
+            failed += 1
+
+        if solve(board, 'dlx')[0] == solution and count_solutions(board) == 1:
+            print(f"PASS: Dancing Links agrees on {difficulty} and finds one solution")
+            passed += 1
+        else:
+            print(f"FAIL: Dancing Links agrees on {difficulty} and finds one solution")
+            failed += 1
+
+    # A 5 twice in the first row can never be solved
+    solution, _ = solve([[5, 5] + [0]*7] + [[0]*9 for _ in range(8)])
+    if solution is None:
+        print("PASS: Conflicting clues have no solution")
+        passed += 1
+    else:
+        print("FAIL: Conflicting clues have no solution")
+        failed += 1
+
+    # A blank 16x16 board must fill every row, column and box with 1-16
+    solution, _ = solve(SudokuBoard.empty(4))
+    if solution is not None and all(mask == 0xFFFF for masks in _build_state(solution)[1:] for mask in masks):
+        print("PASS: Solve an empty 16x16 board")
+        passed += 1
+    else:
+        print("FAIL: Solve an empty 16x16 board")
+        failed += 1
+
+    # Generated puzzles must have exactly one solution and match the difficulty asked for
+    for difficulty in DIFFICULTIES:
+        puzzle = generate_puzzle(difficulty, seed=131)
+        if count_solutions(puzzle) == 1 and grade_puzzle(puzzle) == difficulty:
+            print(f"PASS: Generate a unique {difficulty} puzzle")
+            passed += 1
+        else:
+            print(f"FAIL: Generate a unique {difficulty} puzzle")
+            failed += 1
+
+    # An empty board has many solutions, so counting stops at the limit
+    if count_solutions([[0]*9 for _ in range(9)], limit=2) == 2:
+        print("PASS: Counting stops at the limit")
+        passed += 1
+    else:
+        print("FAIL: Counting stops at the limit")
+        failed += 1
+
+    print(f"\nTest Summary: {passed} passed, {failed} failed.\n")
+
+
+
+def main(fast=False):
     '''
     Main function to manage game setup, execution, and returning to the main menu.
+    
+    Parameters:
+        fast (bool): True to play without pauses or 'cls' shells (see play_game()).
     '''
     app_running = True  # Flag to control the main application loop
 
@@ -312,15 +1875,69 @@ def main():
         # Ask the user for a difficulty level
         difficulty = input("Enter a difficulty (Easy, Medium, Hard): ").capitalize()
         
-        # Attempt to load a game board for the given difficulty
-        if (board := load_game(difficulty)):
+        # Attempt to load a game board for the given difficulty,
+        # generating a fresh one if its file is missing
+        board = load_game(difficulty)
+        if board is None and difficulty in DIFFICULTIES:
+            print(f"Generating a new {difficulty} puzzle instead.")
+            board = SudokuBoard(generate_puzzle(difficulty))
+        if board:
             display_instructions()
             # If the user quits during play_game, exit the main loop
-            app_running = not play_game(board, difficulty)
+            app_running = not play_game(board, difficulty, fast)
         else:
             print("Invalid difficulty or file not found. Please try again.")
 
 # Run the main function when the script is executed
 if __name__ == "__main__":
-    test_is_valid_move()
-    main()
+    parser = argparse.ArgumentParser(description="Play Sudoku, or solve a file of puzzles in batch.")
+    parser.add_argument("--batch", nargs=2, metavar=("INPUT", "OUTPUT"),
+                        help="solve one puzzle per line (81 characters for 9x9) from INPUT into OUTPUT")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="worker processes for --batch (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=1000,
+                        help="puzzles sent to a worker at a time for --batch")
+    parser.add_argument("--backend", choices=SOLVER_BACKENDS, default='propagation',
+                        help="solver used by --batch")
+    parser.add_argument("--scaling", metavar="INPUT",
+                        help="time --batch on INPUT with 1, 2, 4, ... up to --processes workers")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="time each solver backend on the bundled puzzles")
+    parser.add_argument("--generate", type=int, metavar="COUNT",
+                        help="print COUNT new puzzles, one per line")
+    parser.add_argument("--difficulty", choices=DIFFICULTIES, default='Medium',
+                        help="difficulty of puzzles made by --generate")
+    parser.add_argument("--replay", metavar="MOVES",
+                        help="apply a move log (one 'G5 3' per line) to the --difficulty board and report")
+    parser.add_argument("--fast", action="store_true",
+                        help="play without pauses, clearing the screen with ANSI codes")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark_backends()
+    elif args.scaling:
+        benchmark_batch(args.scaling, args.processes, args.chunk_size, args.backend)
+    elif args.replay:
+        if (board := load_game(args.difficulty)):
+            report = replay_moves(board, args.replay)
+            display_board(board)
+            print(f"Replayed {report['moves']} moves ({report['accepted']} accepted, "
+                  f"rejected: {report['rejected']}) at {report['moves_per_second']:.0f} moves/second")
+    elif args.generate:
+        start_time = time.perf_counter()
+        for _ in range(args.generate):
+            print(format_puzzle(generate_puzzle(args.difficulty)))
+        seconds = time.perf_counter() - start_time
+        print(f"Generated {args.generate} {args.difficulty} puzzles in {seconds:.2f}s", file=sys.stderr)
+    elif args.batch:
+        report = solve_batch(args.batch[0], args.batch[1], args.processes, args.chunk_size, args.backend)
+        print(f"Solved {report['puzzles']} puzzles ({report['unsolvable']} unsolvable, "
+              f"{report['invalid']} invalid lines) "
+              f"in {report['seconds']:.2f}s: {report['puzzles_per_second']:.0f} puzzles/second")
+    else:
+        test_is_valid_move()
+        test_solve()
+        test_replay_moves()
+        test_puzzle_store()
+        test_batch()
+        main(args.fast)
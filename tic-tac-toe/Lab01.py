@@ -15,6 +15,7 @@
 import json
 import time
 import os
+import sys
 
 # The characters used in the Tic-Tac-Too board.
 # These are constants and therefore should never have to change.
@@ -22,6 +23,11 @@ X = 'X'
 O = 'O'
 BLANK = ' '
 
+# Run with '--fast' to play without pauses; the screen is then cleared with an
+# ANSI escape code instead of starting a 'cls' shell on every move.
+FAST = '--fast' in sys.argv
+ANSI_CLEAR = "\033[2J\033[H"
+
 # A blank Tic-Tac-Toe board. We should not need to change this board;
 # it is only used to reset the board to blank. This should be the format
 # of the code in the JSON file.
@@ -54,15 +60,31 @@ def save_board(filename, board):
     with open("tic-tac-toe/tictactoe.json", "w") as file:
         json.dump({'board': board}, file)
 
+def show_error(text):
+    '''Show an error on a cleared screen for two seconds (the default, paced mode).'''
+    os.system('cls')
+    print(text)
+    pause(2)
+    os.system('cls')
+
+def pause(seconds):
+    '''Wait so the player can read a message, unless we are in fast mode.'''
+    if not FAST:
+        time.sleep(seconds)
+
+def render_board(board):
+    '''Build the text of a Tic-Tac-Toe board so it can be written in one call.'''
+    return (f" {board[0]} | {board[1]} | {board[2]} \n"
+            "---+---+---\n"
+            f" {board[3]} | {board[4]} | {board[5]} \n"
+            "---+---+---\n"
+            f" {board[6]} | {board[7]} | {board[8]} \n")
+
 def display_board(board):
     '''Display a Tic-Tac-Toe board on the screen in a user-friendly way.'''
     # Put display code here.
 
-    print(f" {board[0]} | {board[1]} | {board[2]} ")
-    print("---+---+---")
-    print(f" {board[3]} | {board[4]} | {board[5]} ")
-    print("---+---+---")
-    print(f" {board[6]} | {board[7]} | {board[8]} ")
+    sys.stdout.write(render_board(board))
 
 def is_x_turn(board):
     '''Determine whose turn it is.'''
@@ -79,11 +101,21 @@ def play_game(board):
     '''Play the game of Tic-Tac-Toe.'''
     # Put game play code here. Return False when the user has indicated they are done.
 
+    # in fast mode an error from the last move is shown under the board in the next
+    # frame, since there is no pause to read it before the clear
+    message = ""
+
     while True:
-        # start the game by displaying the board
-        os.system('cls')
-        display_instructions()
-        display_board(board)
+        # start the game by displaying the board, the whole frame in one write
+        if FAST:
+            sys.stdout.write(ANSI_CLEAR + INSTRUCTIONS + render_board(board)
+                             + (message + "\n" if message else ""))
+            sys.stdout.flush()
+        else:
+            os.system('cls')
+            display_instructions()
+            display_board(board)
+        message = ""
 
         # get what players turn it is
         # if is_x_turn is true than its X's turn, otherwise it is O's turn
@@ -97,16 +129,16 @@ def play_game(board):
          # convert player input to lower and if its 'q' close game
         if move.lower() == 'q':
             print("Please wait while we save your game :)")
-            time.sleep(2)
+            pause(2)
             save_board(file_name, board)
             exit() # end/close the game
         
         # see if input is a number and within the bounds, if not show error, but allow re entry
         if not move.isdigit() or int(move) < 1 or int(move) > 9:
-            os.system('cls')
-            print("ERROR! Invalid Input: Chose a number from (1-9)")
-            time.sleep(2)
-            os.system('cls')
+            if FAST:
+                message = "ERROR! Invalid Input: Chose a number from (1-9)"
+            else:
+                show_error("ERROR! Invalid Input: Chose a number from (1-9)")
             continue
 
         # get the position, and format it for the index
@@ -114,7 +146,10 @@ def play_game(board):
 
         #check if position is empty, if not alrt user and allow re entry
         if board[position] != BLANK:
-            print("This space is full, chose another!")
+            if FAST:
+                message = "This space is full, chose another!"
+            else:
+                show_error("This space is full, chose another!")
             continue
 
         #set board position to current player
@@ -138,7 +173,7 @@ def game_done(board, message=False):
         if board[row * 3] != BLANK and board[row * 3] == board[row * 3 + 1] == board[row * 3 + 2]:
             if message:
                 print("The game was won by", board[row * 3])
-                time.sleep(3)
+                pause(3)
             return True
 
     # Game is finished if someone has completed a column.
@@ -146,7 +181,7 @@ def game_done(board, message=False):
         if board[col] != BLANK and board[col] == board[3 + col] == board[6 + col]:
             if message:
                 print("The game was won by", board[col])
-                time.sleep(2)
+                pause(2)
             return True
 
     # Game is finished if someone has a diagonal.
@@ -154,7 +189,7 @@ def game_done(board, message=False):
                               board[2] == board[4] == board[6]):
         if message:
             print("The game was won by", board[4])
-            time.sleep(2)
+            pause(2)
         return True
 
     # Game is finished if all the squares are filled.
@@ -165,7 +200,7 @@ def game_done(board, message=False):
     if tie:
         if message:
             print("The game is a tie!")
-            time.sleep(2)
+            pause(2)
         return True
 
 
@@ -173,16 +208,18 @@ def game_done(board, message=False):
 
 # These user-instructions are provided and do not need to be changed.
 
+INSTRUCTIONS = ("Enter 'q' to suspend your game. Otherwise, enter a number from 1 to 9\n"
+                "where the following numbers correspond to the locations on the grid:\n"
+                " 1 | 2 | 3 \n"
+                "---+---+---\n"
+                " 4 | 5 | 6 \n"
+                "---+---+---\n"
+                " 7 | 8 | 9 \n\n"
+                "The current board is:\n")
+
 #make this a function to call easier
 def display_instructions():
-    print("Enter 'q' to suspend your game. Otherwise, enter a number from 1 to 9")
-    print("where the following numbers correspond to the locations on the grid:")
-    print(" 1 | 2 | 3 ")
-    print("---+---+---")
-    print(" 4 | 5 | 6 ")
-    print("---+---+---")
-    print(" 7 | 8 | 9 \n")
-    print("The current board is:")
+    sys.stdout.write(INSTRUCTIONS)
 
 # The file read code, game loop code, and file close code goes here.
 
@@ -206,7 +243,7 @@ while active_game:
         #once game is done let player know game is resetting
     
         print("Resetting Game. Please wait...")
-        time.sleep(2)
+        pause(2)
         
         #reset the board
         board = blank_board['board']
@@ -216,7 +253,7 @@ while active_game:
         #notify user that game is ready
     
         print("The game has been reset. Start playing again!")
-        time.sleep(2)
+        pause(2)
         
 
         #show the instructions again and the new board